@@ -5,47 +5,45 @@ Filters RTA data for DPF-related maintenance and creates master dataset
 
 import pandas as pd
 import numpy as np
+import polars as pl
+import polars.selectors as cs
 from pathlib import Path
+from dpf_data import (
+    CACHE_DIR, DIAGNOSTIC_DTYPES, DIAGNOSTIC_USECOLS, SENSOR_COLUMNS,
+    cached_parquet, load_and_filter_rta_data
+)
 
-def load_and_filter_rta_data():
-    """Load RTA data and filter for DPF-related maintenance events"""
-    print("Loading RTA data...")
-    rta_df = pd.read_csv('data/rta-data.csv')
-    
-    print(f"Total RTA records: {len(rta_df)}")
-    print(f"Columns: {list(rta_df.columns)}")
-    
-    # Filter for DPF-related maintenance
-    dpf_keywords = ["FILTER - DIESEL PARTICULATE", "EXHAUST SYSTEM", "EXHAUST SYSTEM INSPECT DIAGNOSE"]
-    
-    dpf_mask = rta_df['lines_jobDescriptions'].isin(dpf_keywords)
-    dpf_rta = rta_df[dpf_mask].copy()
-    
-    print(f"DPF-related maintenance records: {len(dpf_rta)}")
-    print(f"Unique VINs with DPF issues: {dpf_rta['VIN Number'].nunique()}")
-    print(f"Unique Vehicle Numbers with DPF issues: {dpf_rta['Vehicle_Number'].nunique()}")
-    
-    # Show breakdown by job description
-    print("\nDPF maintenance breakdown:")
-    print(dpf_rta['lines_jobDescriptions'].value_counts())
-    
-    return dpf_rta
+# Copy-on-write makes masked slices safe to modify without defensive .copy() calls
+pd.options.mode.copy_on_write = True
 
-def load_vehicle_stats():
-    """Load vehicle statistics data"""
+def vehicle_stats_schema(csv_path):
+    """Schema overrides reading VINs as strings and the known sensor readings as float32"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    schema = {col: pl.Float32 for col in header if col in SENSOR_COLUMNS}
+    schema['vin'] = pl.String
+    return schema
+
+def load_vehicle_stats(dpf_vins):
+    """Load vehicle statistics data for DPF-affected vehicles"""
     print("\nLoading vehicle statistics data...")
     
-    # Load in chunks due to large file size
-    chunk_size = 50000
-    chunks = []
-    
-    for chunk in pd.read_csv('data/vehicle-stats.csv', chunksize=chunk_size):
-        chunks.append(chunk)
-        if len(chunks) % 10 == 0:
-            print(f"Loaded {len(chunks) * chunk_size} rows...")
-    
-    vehicle_stats = pd.concat(chunks, ignore_index=True)
-    print(f"Total vehicle stats records: {len(vehicle_stats)}")
+    # Push the VIN filter into a lazy scan so only DPF vehicle rows are materialized; columns
+    # outside the known sensors are inferred from every row, as read_csv did, and any that
+    # infer as float64 are downcast too
+    vehicle_stats = (
+        pl.scan_csv(
+            'data/vehicle-stats.csv',
+            schema_overrides=vehicle_stats_schema('data/vehicle-stats.csv'),
+            infer_schema_length=None,
+            try_parse_dates=True
+        )
+        .filter(pl.col('vin').is_in(dpf_vins))
+        .with_columns(cs.float().cast(pl.Float32))
+        .collect(engine='streaming')
+        .to_pandas(use_pyarrow_extension_array=True)
+    )
+    vehicle_stats['vin'] = vehicle_stats['vin'].astype('category')
+    print(f"Vehicle stats records for DPF VINs: {len(vehicle_stats)}")
     print(f"Unique VINs in vehicle stats: {vehicle_stats['vin'].nunique()}")
     
     return vehicle_stats
@@ -53,7 +51,12 @@ def load_vehicle_stats():
 def load_diagnostic_data():
     """Load diagnostic data"""
     print("\nLoading diagnostic data...")
-    diagnostic_df = pd.read_csv('data/diagnostic-data.csv')
+    diagnostic_df = pd.read_csv(
+        'data/diagnostic-data.csv',
+        usecols=lambda col: col in DIAGNOSTIC_USECOLS,
+        dtype=DIAGNOSTIC_DTYPES
+    )
+    diagnostic_df['Time'] = pd.to_datetime(diagnostic_df['Time'], format='ISO8601')
     
     print(f"Total diagnostic records: {len(diagnostic_df)}")
     print(f"Unique Asset Names: {diagnostic_df['Asset Name'].nunique()}")
@@ -64,55 +67,53 @@ def create_master_dataset(dpf_rta, vehicle_stats, diagnostic_df):
     """Merge all datasets to create master dataset for analysis"""
     print("\nCreating master dataset...")
     
-    # Get unique VINs and Vehicle Numbers from DPF maintenance
+    # Get unique VINs from DPF maintenance
     dpf_vins = dpf_rta['VIN Number'].dropna().unique()
-    dpf_vehicle_numbers = dpf_rta['Vehicle_Number'].dropna().unique()
     
     print(f"Filtering vehicle stats for {len(dpf_vins)} VINs...")
     
     # Filter vehicle stats for DPF-affected vehicles
-    dpf_vehicle_stats = vehicle_stats[vehicle_stats['vin'].isin(dpf_vins)].copy()
+    dpf_vehicle_stats = vehicle_stats[vehicle_stats['vin'].isin(dpf_vins)]
+    dpf_vehicle_stats['vin'] = dpf_vehicle_stats['vin'].cat.remove_unused_categories()
     print(f"Vehicle stats records for DPF vehicles: {len(dpf_vehicle_stats)}")
     
     # Filter diagnostic data for DPF-affected vehicles
-    # Convert vehicle numbers to strings for matching
-    dpf_vehicle_numbers_str = [str(x) for x in dpf_vehicle_numbers]
-    dpf_diagnostic = diagnostic_df[diagnostic_df['Asset Name'].astype(str).isin(dpf_vehicle_numbers_str)].copy()
+    # Asset Name is read as a categorical column, so match against a pre-hashed Index
+    # instead of building a str copy of the whole column; the Index is built vectorially
+    # from the Arrow-backed vehicle numbers rather than boxing each one into a Python str
+    dpf_vehicle_numbers_idx = pd.Index(dpf_rta['Vehicle_Number'].dropna().astype('string[pyarrow]').unique())
+    dpf_diagnostic = diagnostic_df[diagnostic_df['Asset Name'].isin(dpf_vehicle_numbers_idx)]
+    dpf_diagnostic['Asset Name'] = dpf_diagnostic['Asset Name'].cat.remove_unused_categories()
     print(f"Diagnostic records for DPF vehicles: {len(dpf_diagnostic)}")
     
-    # Convert time columns to datetime
-    if 'time' in dpf_vehicle_stats.columns:
-        dpf_vehicle_stats['time'] = pd.to_datetime(dpf_vehicle_stats['time'])
-    
-    if 'Time' in dpf_diagnostic.columns:
-        dpf_diagnostic['Time'] = pd.to_datetime(dpf_diagnostic['Time'])
-    
-    if 'Date of Issue' in dpf_rta.columns:
-        dpf_rta['Date of Issue'] = pd.to_datetime(dpf_rta['Date of Issue'])
-    
     return dpf_rta, dpf_vehicle_stats, dpf_diagnostic
 
 def save_processed_data(dpf_rta, dpf_vehicle_stats, dpf_diagnostic):
     """Save processed datasets"""
     print("\nSaving processed datasets...")
     
-    dpf_rta.to_csv('data/dpf_maintenance_records.csv', index=False)
-    dpf_vehicle_stats.to_csv('data/dpf_vehicle_stats.csv', index=False)
-    dpf_diagnostic.to_csv('data/dpf_diagnostic_data.csv', index=False)
+    # Parquet keeps dtypes and is much smaller/faster to reload than CSV
+    dpf_rta.to_parquet('data/dpf_maintenance_records.parquet', compression='zstd', engine='pyarrow', index=False)
+    dpf_vehicle_stats.to_parquet('data/dpf_vehicle_stats.parquet', compression='zstd', engine='pyarrow', index=False)
+    dpf_diagnostic.to_parquet('data/dpf_diagnostic_data.parquet', compression='zstd', engine='pyarrow', index=False)
     
     print("Saved:")
-    print(f"- dpf_maintenance_records.csv ({len(dpf_rta)} records)")
-    print(f"- dpf_vehicle_stats.csv ({len(dpf_vehicle_stats)} records)")
-    print(f"- dpf_diagnostic_data.csv ({len(dpf_diagnostic)} records)")
+    print(f"- dpf_maintenance_records.parquet ({len(dpf_rta)} records)")
+    print(f"- dpf_vehicle_stats.parquet ({len(dpf_vehicle_stats)} records)")
+    print(f"- dpf_diagnostic_data.parquet ({len(dpf_diagnostic)} records)")
 
 def main():
     """Main data munging pipeline"""
     print("=== DPF Data Munging Pipeline ===")
     
-    # Load and filter data
-    dpf_rta = load_and_filter_rta_data()
-    vehicle_stats = load_vehicle_stats()
-    diagnostic_df = load_diagnostic_data()
+    # Load and filter data (cached as Parquet until the source CSVs change)
+    dpf_rta = cached_parquet(['data/rta-data.csv'], CACHE_DIR / 'dpf_rta.parquet', load_and_filter_rta_data)
+    dpf_vins = dpf_rta['VIN Number'].dropna().unique().tolist()
+    vehicle_stats = cached_parquet(
+        ['data/rta-data.csv', 'data/vehicle-stats.csv'], CACHE_DIR / 'dpf_vehicle_stats.parquet',
+        load_vehicle_stats, dpf_vins
+    )
+    diagnostic_df = cached_parquet(['data/diagnostic-data.csv'], CACHE_DIR / 'diagnostic.parquet', load_diagnostic_data)
     
     # Create master dataset
     dpf_rta, dpf_vehicle_stats, dpf_diagnostic = create_master_dataset(
@@ -127,7 +128,7 @@ def main():
     # Summary statistics
     print(f"\nSummary:")
     print(f"- DPF maintenance events: {len(dpf_rta)}")
-    print(f"- Vehicles with DPF issues: {dpf_rta['VIN Number'].nunique()}")
+    print(f"- Vehicles with DPF issues: {len(dpf_vins)}")
     print(f"- Vehicle stats records: {len(dpf_vehicle_stats)}")
     print(f"- Diagnostic records: {len(dpf_diagnostic)}")
 
@@ -5,81 +5,100 @@ Incorporates 2023-2024 vehicle stats, driver details, and DTC data for RUL analy
 
 import pandas as pd
 import numpy as np
+import polars as pl
+import polars.selectors as cs
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dpf_data import (
+    CACHE_DIR, DIAGNOSTIC_DTYPES, DIAGNOSTIC_USECOLS, SENSOR_COLUMNS,
+    cached_parquet, load_and_filter_rta_data
+)
 
-def load_and_filter_rta_data():
-    """Load RTA data and filter for DPF-related maintenance events"""
-    print("Loading RTA data...")
-    rta_df = pd.read_csv('data/rta-data.csv')
-    
-    print(f"Total RTA records: {len(rta_df)}")
-    print(f"Columns: {list(rta_df.columns)}")
-    
-    # Filter for DPF-related maintenance
-    dpf_keywords = ["FILTER - DIESEL PARTICULATE", "EXHAUST SYSTEM", "EXHAUST SYSTEM INSPECT DIAGNOSE"]
-    
-    dpf_mask = rta_df['lines_jobDescriptions'].isin(dpf_keywords)
-    dpf_rta = rta_df[dpf_mask].copy()
-    
-    print(f"DPF-related maintenance records: {len(dpf_rta)}")
-    print(f"Unique VINs with DPF issues: {dpf_rta['VIN Number'].nunique()}")
-    print(f"Unique Vehicle Numbers with DPF issues: {dpf_rta['Vehicle_Number'].nunique()}")
-    
-    # Show breakdown by job description
-    print("\nDPF maintenance breakdown:")
-    print(dpf_rta['lines_jobDescriptions'].value_counts())
-    
-    return dpf_rta
+# 2024 file first so its rows win when deduplicating the overlap
+VEHICLE_STATS_FILES = ['data/vehicle-stats.csv', 'data/vehicle_stats_23-24.csv']
+
+# Copy-on-write makes masked slices safe to modify without defensive .copy() calls
+pd.options.mode.copy_on_write = True
 
-def load_enhanced_vehicle_stats():
-    """Load both 2024 and 2023-2024 vehicle statistics data"""
+def vehicle_stats_csv_format(column_types):
+    """CSV format applying column_types, with empty fields read as nulls as read_csv did"""
+    return ds.CsvFileFormat(convert_options=pv.ConvertOptions(column_types=column_types, strings_can_be_null=True))
+
+def load_enhanced_vehicle_stats(dpf_vins):
+    """Load both 2024 and 2023-2024 vehicle statistics data for DPF-affected vehicles"""
     print("\nLoading enhanced vehicle statistics data...")
+    print(f"Loading {', '.join(Path(path).name for path in VEHICLE_STATS_FILES)}...")
     
-    # Load original 2024 data
-    print("Loading vehicle-stats.csv (2024)...")
-    chunk_size = 50000
-    chunks_2024 = []
-    
-    for chunk in pd.read_csv('data/vehicle-stats.csv', chunksize=chunk_size):
-        chunks_2024.append(chunk)
-        if len(chunks_2024) % 20 == 0:
-            print(f"  Loaded {len(chunks_2024) * chunk_size} rows from 2024 data...")
-    
-    vehicle_stats_2024 = pd.concat(chunks_2024, ignore_index=True)
-    print(f"2024 vehicle stats: {len(vehicle_stats_2024)} records")
-    
-    # Load new 2023-2024 data
-    print("Loading vehicle_stats_23-24.csv...")
-    chunks_2324 = []
-    
-    for chunk in pd.read_csv('data/vehicle_stats_23-24.csv', chunksize=chunk_size):
-        chunks_2324.append(chunk)
-        if len(chunks_2324) % 20 == 0:
-            print(f"  Loaded {len(chunks_2324) * chunk_size} rows from 2023-24 data...")
-    
-    vehicle_stats_2324 = pd.concat(chunks_2324, ignore_index=True)
-    print(f"2023-2024 vehicle stats: {len(vehicle_stats_2324)} records")
+    # Find common columns from the file headers, keeping the 2024 file's column order
+    headers = [pd.read_csv(path, nrows=0).columns for path in VEHICLE_STATS_FILES]
+    common_cols = headers[0].intersection(headers[1]).tolist()
+    print(f"Common columns between datasets: {len(common_cols)}")
     
-    # Combine datasets
-    print("Combining vehicle stats datasets...")
+    # Read VINs as strings and the known sensor readings as float32; Arrow infers the other
+    # shared columns, and any it only sees empty values for (null type) are read as text
+    column_types = {col: pa.float32() for col in common_cols if col in SENSOR_COLUMNS}
+    column_types['vin'] = pa.string()
+    inferred_schema = ds.dataset(
+        VEHICLE_STATS_FILES,
+        format=vehicle_stats_csv_format(column_types)
+    ).schema
+    column_types.update({field.name: pa.string() for field in inferred_schema if pa.types.is_null(field.type)})
+    
+    # Treat both files as one Arrow dataset: fragments are parsed in parallel with a
+    # shared schema, and only common columns of DPF vehicle rows are materialized
+    vehicle_stats_ds = ds.dataset(
+        VEHICLE_STATS_FILES,
+        format=vehicle_stats_csv_format(column_types)
+    )
+    scanner = vehicle_stats_ds.scanner(
+        columns=common_cols,
+        filter=pc.field('vin').isin(dpf_vins),
+        use_threads=True
+    )
     
-    # Standardize column names and ensure compatibility
-    vehicle_stats_2024['time'] = pd.to_datetime(vehicle_stats_2024['time'])
-    vehicle_stats_2324['time'] = pd.to_datetime(vehicle_stats_2324['time'])
+    # Keep track of which file each batch came from so the dedup can be limited below
+    batches_by_file = {path: [] for path in vehicle_stats_ds.files}
+    for tagged_batch in scanner.scan_batches():
+        batches_by_file[tagged_batch.fragment.path].append(tagged_batch.record_batch)
+    stats_2024, stats_2324 = (
+        pl.from_arrow(pa.Table.from_batches(batches, schema=scanner.projected_schema))
+        for batches in batches_by_file.values()
+    )
+    print(f"Vehicle stats records for DPF VINs (before dedup): {len(stats_2024) + len(stats_2324)}")
     
-    # Find common columns
-    common_cols = list(set(vehicle_stats_2024.columns) & set(vehicle_stats_2324.columns))
-    print(f"Common columns between datasets: {len(common_cols)}")
+    # Dedupe each export on its own first, so repeated (time, vin) rows within one file are
+    # dropped wherever they fall
+    stats_2024, stats_2324 = (
+        stats.unique(subset=['time', 'vin'], keep='first', maintain_order=True)
+        for stats in (stats_2024, stats_2324)
+    )
     
-    # Use only common columns for consistent analysis
-    vehicle_stats_combined = pd.concat([
-        vehicle_stats_2024[common_cols],
-        vehicle_stats_2324[common_cols]
-    ], ignore_index=True)
+    # Cross-file duplicates can then only occur where the two files' time ranges overlap
+    # (or among null times), so hash just that window instead of the full union; an empty
+    # export or one with no parsed times has no range, so there is no window to dedupe
+    time_ranges = [(stats['time'].min(), stats['time'].max()) for stats in (stats_2024, stats_2324)]
+    if all(lo is not None for lo, _ in time_ranges):
+        overlap_lo = max(lo for lo, _ in time_ranges)
+        overlap_hi = min(hi for _, hi in time_ranges)
+        in_overlap = pl.col('time').is_between(overlap_lo, overlap_hi) | pl.col('time').is_null()
+        
+        overlap = (
+            pl.concat([stats_2024.filter(in_overlap), stats_2324.filter(in_overlap)])
+            .unique(subset=['time', 'vin'], keep='first', maintain_order=True)
+        )
+        combined = pl.concat([stats_2024.filter(~in_overlap), overlap, stats_2324.filter(~in_overlap)])
+    else:
+        combined = pl.concat([stats_2024, stats_2324])
+    vehicle_stats_combined = combined.with_columns(cs.float().cast(pl.Float32)).to_pandas(use_pyarrow_extension_array=True)
+    vehicle_stats_combined['vin'] = vehicle_stats_combined['vin'].astype('category')
     
-    # Remove duplicates based on time and vin
-    vehicle_stats_combined = vehicle_stats_combined.drop_duplicates(subset=['time', 'vin'])
+    # Standardize time column
+    vehicle_stats_combined['time'] = pd.to_datetime(vehicle_stats_combined['time'], format='ISO8601')
     
     print(f"Combined vehicle stats: {len(vehicle_stats_combined)} records")
     print(f"Date range: {vehicle_stats_combined['time'].min()} to {vehicle_stats_combined['time'].max()}")
@@ -87,27 +106,49 @@ def load_enhanced_vehicle_stats():
     
     return vehicle_stats_combined
 
+def parse_diagnostic_time(time_col):
+    """Parse ISO8601 diagnostic timestamps as UTC; unparseable values become NaT"""
+    return pd.to_datetime(time_col, format='ISO8601', utc=True, errors='coerce')
+
 def load_diagnostic_and_dtc_data():
     """Load diagnostic data and DTC data"""
     print("\nLoading diagnostic and DTC data...")
     
     # Load original diagnostic data
-    diagnostic_df = pd.read_csv('data/diagnostic-data.csv')
+    diagnostic_df = pd.read_csv(
+        'data/diagnostic-data.csv',
+        usecols=lambda col: col in DIAGNOSTIC_USECOLS,
+        dtype=DIAGNOSTIC_DTYPES
+    )
+    diagnostic_df['Time'] = parse_diagnostic_time(diagnostic_df['Time'])
     print(f"Original diagnostic records: {len(diagnostic_df)}")
     
     # Load DTC data
-    dtc_df = pd.read_csv('data/dtc.csv')
+    dtc_df = pd.read_csv(
+        'data/dtc.csv',
+        usecols=lambda col: col in DIAGNOSTIC_USECOLS,
+        dtype=DIAGNOSTIC_DTYPES
+    )
+    dtc_df['Time'] = parse_diagnostic_time(dtc_df['Time'])
     print(f"DTC records: {len(dtc_df)}")
     
     # Combine diagnostic datasets
     print("Combining diagnostic datasets...")
     
-    # Ensure both have same column structure
-    if set(diagnostic_df.columns) == set(dtc_df.columns):
-        combined_diagnostic = pd.concat([diagnostic_df, dtc_df], ignore_index=True)
+    # Ensure both provide the same of the diagnostic columns read (only DIAGNOSTIC_USECOLS are loaded)
+    missing_cols = {
+        name: [col for col in DIAGNOSTIC_USECOLS if col not in df.columns]
+        for name, df in [('diagnostic-data.csv', diagnostic_df), ('dtc.csv', dtc_df)]
+    }
+    if missing_cols['diagnostic-data.csv'] == missing_cols['dtc.csv']:
+        # Concatenating categoricals with different categories falls back to object, so re-categorize
+        combined_diagnostic = pd.concat([diagnostic_df, dtc_df], ignore_index=True).astype(DIAGNOSTIC_DTYPES)
         print(f"Combined diagnostic records: {len(combined_diagnostic)}")
     else:
         print("Column mismatch between diagnostic datasets - using original only")
+        for name, cols in missing_cols.items():
+            if cols:
+                print(f"  {name} is missing {cols}")
         combined_diagnostic = diagnostic_df
     
     print(f"Unique Asset Names: {combined_diagnostic['Asset Name'].nunique()}")
@@ -132,35 +173,37 @@ def create_enhanced_master_dataset(dpf_rta, vehicle_stats, diagnostic_df, driver
     
     # Get unique identifiers from DPF maintenance
     dpf_vins = dpf_rta['VIN Number'].dropna().unique()
-    dpf_vehicle_numbers = dpf_rta['Vehicle_Number'].dropna().unique()
+    dpf_vehicle_numbers = dpf_rta['Vehicle_Number'].dropna().astype('string[pyarrow]').unique()
     
     print(f"Filtering data for {len(dpf_vins)} VINs and {len(dpf_vehicle_numbers)} vehicle numbers...")
     
     # Filter vehicle stats for DPF-affected vehicles
-    dpf_vehicle_stats = vehicle_stats[vehicle_stats['vin'].isin(dpf_vins)].copy()
+    dpf_vehicle_stats = vehicle_stats[vehicle_stats['vin'].isin(dpf_vins)]
+    dpf_vehicle_stats['vin'] = dpf_vehicle_stats['vin'].cat.remove_unused_categories()
     print(f"Vehicle stats records for DPF vehicles: {len(dpf_vehicle_stats)}")
     
     # Filter diagnostic data for DPF-affected vehicles
-    dpf_vehicle_numbers_str = [str(x) for x in dpf_vehicle_numbers]
-    dpf_diagnostic = diagnostic_df[diagnostic_df['Asset Name'].astype(str).isin(dpf_vehicle_numbers_str)].copy()
+    # Asset Name is read as a categorical column, so match against a pre-hashed Index
+    # instead of building a str copy of the whole column; the Index is built vectorially
+    # from the Arrow-backed vehicle numbers rather than boxing each one into a Python str
+    dpf_vehicle_numbers_idx = pd.Index(dpf_vehicle_numbers)
+    dpf_diagnostic = diagnostic_df[diagnostic_df['Asset Name'].isin(dpf_vehicle_numbers_idx)]
+    dpf_diagnostic['Asset Name'] = dpf_diagnostic['Asset Name'].cat.remove_unused_categories()
     print(f"Diagnostic records for DPF vehicles: {len(dpf_diagnostic)}")
     
-    # Convert time columns to datetime (handling timezone issues)
+    # Drop timezones (handling timezone issues); time columns are parsed at load
     if 'time' in dpf_vehicle_stats.columns:
-        dpf_vehicle_stats['time'] = pd.to_datetime(dpf_vehicle_stats['time']).dt.tz_localize(None)
+        dpf_vehicle_stats['time'] = dpf_vehicle_stats['time'].dt.tz_localize(None)
     
     if 'Time' in dpf_diagnostic.columns:
-        dpf_diagnostic['Time'] = pd.to_datetime(dpf_diagnostic['Time'], errors='coerce').dt.tz_localize(None)
-    
-    if 'Date of Issue' in dpf_rta.columns:
-        dpf_rta['Date of Issue'] = pd.to_datetime(dpf_rta['Date of Issue'])
+        dpf_diagnostic['Time'] = dpf_diagnostic['Time'].dt.tz_localize(None)
     
     # Create vehicle mapping for driver data integration
-    vehicle_driver_mapping = create_vehicle_driver_mapping(dpf_rta, driver_df)
+    vehicle_driver_mapping = create_vehicle_driver_mapping(driver_df, len(dpf_vehicle_numbers))
     
     return dpf_rta, dpf_vehicle_stats, dpf_diagnostic, driver_df, vehicle_driver_mapping
 
-def create_vehicle_driver_mapping(dpf_rta, driver_df):
+def create_vehicle_driver_mapping(driver_df, n_vehicles):
     """Create mapping between vehicles and drivers for enhanced analysis"""
     print("\nCreating vehicle-driver mapping...")
     
@@ -169,7 +212,7 @@ def create_vehicle_driver_mapping(dpf_rta, driver_df):
     vehicle_driver_mapping = {
         'note': 'Driver data available but requires vehicle-driver linking logic',
         'drivers': len(driver_df),
-        'vehicles': dpf_rta['Vehicle_Number'].nunique()
+        'vehicles': n_vehicles
     }
     
     print("Driver data loaded but vehicle-driver mapping requires additional business logic")
@@ -180,19 +223,31 @@ def save_enhanced_processed_data(dpf_rta, dpf_vehicle_stats, dpf_diagnostic, dri
     """Save all processed datasets"""
     print("\nSaving enhanced processed datasets...")
     
-    # Save main DPF datasets
-    dpf_rta.to_csv('data/enhanced_dpf_maintenance_records.csv', index=False)
-    dpf_vehicle_stats.to_csv('data/enhanced_dpf_vehicle_stats.csv', index=False)
-    dpf_diagnostic.to_csv('data/enhanced_dpf_diagnostic_data.csv', index=False)
+    # Save main DPF datasets (Parquet keeps dtypes and reloads much faster than CSV)
+    dpf_rta.to_parquet('data/enhanced_dpf_maintenance_records.parquet', compression='zstd', engine='pyarrow', index=False)
+    dpf_vehicle_stats.to_parquet('data/enhanced_dpf_vehicle_stats.parquet', compression='zstd', engine='pyarrow', index=False)
+    dpf_diagnostic.to_parquet('data/enhanced_dpf_diagnostic_data.parquet', compression='zstd', engine='pyarrow', index=False)
     
     # Save driver data (filtered for relevant analysis)
-    driver_df.to_csv('data/enhanced_driver_details.csv', index=False)
+    driver_df.to_parquet('data/enhanced_driver_details.parquet', compression='zstd', engine='pyarrow', index=False)
     
     print("Saved enhanced datasets:")
-    print(f"- enhanced_dpf_maintenance_records.csv ({len(dpf_rta)} records)")
-    print(f"- enhanced_dpf_vehicle_stats.csv ({len(dpf_vehicle_stats)} records)")
-    print(f"- enhanced_dpf_diagnostic_data.csv ({len(dpf_diagnostic)} records)")
-    print(f"- enhanced_driver_details.csv ({len(driver_df)} records)")
+    print(f"- enhanced_dpf_maintenance_records.parquet ({len(dpf_rta)} records)")
+    print(f"- enhanced_dpf_vehicle_stats.parquet ({len(dpf_vehicle_stats)} records)")
+    print(f"- enhanced_dpf_diagnostic_data.parquet ({len(dpf_diagnostic)} records)")
+    print(f"- enhanced_driver_details.parquet ({len(driver_df)} records)")
+
+def arrow_aggregate(df, aggregations):
+    """Compute several (column, function) aggregates over a frame in a single Arrow pass"""
+    columns = list(dict.fromkeys(col for col, _ in aggregations))
+    table = pa.Table.from_pandas(df[columns], preserve_index=False)
+    
+    # Arrow's distinct counting has no dictionary kernel, so decode categoricals first
+    table = pa.table({
+        name: col.cast(col.type.value_type) if pa.types.is_dictionary(col.type) else col
+        for name, col in zip(table.column_names, table.columns)
+    })
+    return table.group_by([]).aggregate(aggregations).to_pylist()[0]
 
 def generate_enhanced_summary(dpf_rta, dpf_vehicle_stats, dpf_diagnostic, driver_df):
     """Generate comprehensive summary of enhanced dataset"""
@@ -200,21 +255,33 @@ def generate_enhanced_summary(dpf_rta, dpf_vehicle_stats, dpf_diagnostic, driver
     print("ENHANCED DATASET SUMMARY")
     print("="*60)
     
+    # Compute each frame's summary stats in one Arrow pass instead of a scan per statistic
+    rta_stats = arrow_aggregate(dpf_rta, [
+        ('VIN Number', 'count_distinct'), ('Date of Issue', 'min'), ('Date of Issue', 'max')
+    ])
+    sensor_stats = arrow_aggregate(dpf_vehicle_stats, [
+        ('vin', 'count_distinct'), ('time', 'min'), ('time', 'max')
+    ])
+    diagnostic_stats = arrow_aggregate(dpf_diagnostic, [
+        ('Asset Name', 'count_distinct'), ('Diagnostic', 'count_distinct')
+    ])
+    n_maintenance_vins = rta_stats['VIN Number_count_distinct']
+    
     print(f"\n📊 MAINTENANCE DATA:")
     print(f"   • DPF maintenance events: {len(dpf_rta)}")
-    print(f"   • Unique vehicles: {dpf_rta['VIN Number'].nunique()}")
-    print(f"   • Date range: {dpf_rta['Date of Issue'].min()} to {dpf_rta['Date of Issue'].max()}")
+    print(f"   • Unique vehicles: {n_maintenance_vins}")
+    print(f"   • Date range: {rta_stats['Date of Issue_min']} to {rta_stats['Date of Issue_max']}")
     
     print(f"\n🚗 VEHICLE SENSOR DATA:")
     print(f"   • Total sensor readings: {len(dpf_vehicle_stats):,}")
-    print(f"   • Unique VINs: {dpf_vehicle_stats['vin'].nunique()}")
-    print(f"   • Date range: {dpf_vehicle_stats['time'].min()} to {dpf_vehicle_stats['time'].max()}")
+    print(f"   • Unique VINs: {sensor_stats['vin_count_distinct']}")
+    print(f"   • Date range: {sensor_stats['time_min']} to {sensor_stats['time_max']}")
     print(f"   • Available sensors: {len([col for col in dpf_vehicle_stats.columns if col not in ['time', 'vin']])}")
     
     print(f"\n🔧 DIAGNOSTIC DATA:")
     print(f"   • Total diagnostic readings: {len(dpf_diagnostic):,}")
-    print(f"   • Unique vehicles: {dpf_diagnostic['Asset Name'].nunique()}")
-    print(f"   • Diagnostic types: {dpf_diagnostic['Diagnostic'].nunique()}")
+    print(f"   • Unique vehicles: {diagnostic_stats['Asset Name_count_distinct']}")
+    print(f"   • Diagnostic types: {diagnostic_stats['Diagnostic_count_distinct']}")
     
     print(f"\n👨‍💼 DRIVER DATA:")
     print(f"   • Total drivers: {len(driver_df)}")
@@ -222,9 +289,11 @@ def generate_enhanced_summary(dpf_rta, dpf_vehicle_stats, dpf_diagnostic, driver
     print(f"   • Total drive time: {driver_df['Drive Time (hh:mm:ss)'].nunique()} unique values")
     
     print(f"\n🎯 RUL ANALYSIS READINESS:")
-    vehicles_with_data = set(dpf_rta['VIN Number'].dropna()) & set(dpf_vehicle_stats['vin'].dropna())
+    vehicles_with_data = pd.Index(dpf_rta['VIN Number'].dropna().unique()).intersection(
+        pd.Index(dpf_vehicle_stats['vin'].dropna().unique())
+    )
     print(f"   • Vehicles with both maintenance & sensor data: {len(vehicles_with_data)}")
-    print(f"   • Data coverage: {len(vehicles_with_data)/dpf_rta['VIN Number'].nunique()*100:.1f}%")
+    print(f"   • Data coverage: {len(vehicles_with_data)/n_maintenance_vins*100:.1f}%")
     
     print(f"\n✅ Ready for enhanced RUL analysis with:")
     print(f"   • Extended time-series data (2023-2025)")
@@ -237,11 +306,29 @@ def main():
     print("=== ENHANCED DPF DATA MUNGING PIPELINE ===")
     print("Incorporating 2023-2024 vehicle stats, driver details, and DTC data")
     
-    # Load and filter data
-    dpf_rta = load_and_filter_rta_data()
-    vehicle_stats = load_enhanced_vehicle_stats()
-    diagnostic_df = load_diagnostic_and_dtc_data()
-    driver_df = load_driver_details()
+    # Load and filter data (cached as Parquet until the source CSVs change). The CSV
+    # parsers release the GIL, so independent loaders run concurrently; vehicle stats
+    # wait only on the RTA load because they are filtered by its VINs.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        fut_rta = executor.submit(
+            cached_parquet, ['data/rta-data.csv'], CACHE_DIR / 'dpf_rta.parquet', load_and_filter_rta_data
+        )
+        fut_diag = executor.submit(
+            cached_parquet, ['data/diagnostic-data.csv', 'data/dtc.csv'], CACHE_DIR / 'diagnostic_dtc.parquet',
+            load_diagnostic_and_dtc_data
+        )
+        fut_drv = executor.submit(
+            cached_parquet, ['data/driver-details.csv'], CACHE_DIR / 'driver_details.parquet', load_driver_details
+        )
+        
+        dpf_rta = fut_rta.result()
+        dpf_vins = dpf_rta['VIN Number'].dropna().unique().tolist()
+        fut_vs = executor.submit(
+            cached_parquet, ['data/rta-data.csv', *VEHICLE_STATS_FILES], CACHE_DIR / 'enhanced_dpf_vehicle_stats.parquet',
+            load_enhanced_vehicle_stats, dpf_vins
+        )
+        
+        vehicle_stats, diagnostic_df, driver_df = (f.result() for f in (fut_vs, fut_diag, fut_drv))
     
     # Create enhanced master dataset
     dpf_rta, dpf_vehicle_stats, dpf_diagnostic, driver_df, vehicle_driver_mapping = create_enhanced_master_dataset(
@@ -14,23 +14,137 @@ Key Features:
 Author: Generated from Jupyter notebook analysis
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
+from pathlib import Path
+import hashlib
 import warnings
-from sklearn.linear_model import LinearRegression
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from numba import njit, prange
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
 
 warnings.filterwarnings('ignore')
 
-# Set up plotting
-plt.style.use('default')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (12, 6)
+# Expanded sensors for comprehensive DPF health monitoring
+KEY_SENSORS = [
+    # Engine Performance Metrics
+    'engineLoadPercent', 'engineRpm', 'ecuSpeedMph',
+    'engineOilPressureKPa', 'engineCoolantTemperatureMilliC',
+    
+    # Fuel & Emissions System
+    'defLevelMilliPercent', 'fuelPercents',
+    
+    # Environmental & Operational
+    'ambientAirTemperatureMilliC', 'intakeManifoldTemperatureMilliC',
+    'barometricPressurePa', 'obdEngineSeconds',
+    
+    # Distance & Usage Patterns
+    'gpsDistanceMeters',
+    
+    # Additional diagnostic parameters that may be available
+    'exhaustTemperature', 'dpfPressureDifferential', 'sootLevel',
+    'regenCycles', 'turbochargerPressure', 'airFlowMass'
+]
+
+# Define sensor-specific thresholds (based on operational knowledge)
+SENSOR_THRESHOLDS = {
+    # Engine Performance
+    'engineLoadPercent': {'high': 80, 'low': 10},
+    'engineRpm': {'high': 2000, 'low': 500},
+    'ecuSpeedMph': {'high': 70, 'low': 5},
+    
+    # Fluid Systems
+    'defLevelMilliPercent': {'high': 95000, 'low': 50000},
+    'fuelPercents': {'high': 95, 'low': 25},
+    'engineOilPressureKPa': {'high': 500, 'low': 200},
+    
+    # Temperature Systems
+    'engineCoolantTemperatureMilliC': {'high': 95000, 'low': 70000},
+    'ambientAirTemperatureMilliC': {'high': 40000, 'low': -10000},
+    'intakeManifoldTemperatureMilliC': {'high': 60000, 'low': 15000},
+    
+    # Pressure & Environmental
+    'barometricPressurePa': {'high': 102000, 'low': 98000},
+    
+    # Usage Patterns
+    'obdEngineSeconds': {'high': 36000, 'low': 3600}  # 10 hours to 1 hour daily
+}
+
+# Thresholds as float32 arrays aligned to KEY_SENSORS (NaN where a sensor has none)
+SENSOR_HIGH = np.array([SENSOR_THRESHOLDS.get(sensor, {}).get('high', np.nan) for sensor in KEY_SENSORS], dtype=np.float32)
+SENSOR_LOW = np.array([SENSOR_THRESHOLDS.get(sensor, {}).get('low', np.nan) for sensor in KEY_SENSORS], dtype=np.float32)
+
+# Per-sensor features, in the column order they are emitted
+FEATURE_TYPES = ['trend_slope', 'trend_strength', 'volatility', 'pct_time_high', 'pct_time_low', 'pattern_change_pct']
+
+# Maintenance fields consumed by the RUL labelling
+MAINTENANCE_COLUMNS = ['VIN Number', 'Vehicle_Number', 'Date of Issue', 'lines_jobDescriptions', 'Total_Cost', 'Downtime Days']
+
+# Combined 2023-2025 sensor readings, deduplicated once and stored with native timestamps
+SENSOR_SOURCES = ['data/dpf_vehicle_stats.parquet', 'data/vehicle_stats_23-24.csv']
+SENSOR_PARQUET = Path('data/rul_vehicle_stats.parquet')
+
+# Extracted RUL feature tables, reused until the inputs or feature definitions change
+RUL_CACHE_DIR = Path('data/cache')
+
+
+def convert_csvs_to_parquet():
+    """Combine and deduplicate the multi-year vehicle stats into Parquet, unless it is already up to date."""
+    if SENSOR_PARQUET.exists() and all(SENSOR_PARQUET.stat().st_mtime >= Path(src).stat().st_mtime for src in SENSOR_SOURCES):
+        return
+    
+    # Load and combine both vehicle stats files for expanded dataset (2023-2025)
+    print("🔄 Converting vehicle stats from multiple years to Parquet...")
+    sensor_columns = ['time', 'vin'] + KEY_SENSORS
+    sensor_table_2024 = pq.read_table(SENSOR_SOURCES[0], columns=[col for col in sensor_columns if col in pq.read_schema(SENSOR_SOURCES[0]).names])
+    
+    # Parse the CSV with Arrow's multithreaded reader, typing timestamps and float32 readings at parse time
+    csv_columns = [col for col in pd.read_csv(SENSOR_SOURCES[1], nrows=0).columns if col in sensor_columns]
+    column_types = {col: pa.float32() for col in csv_columns}
+    column_types.update({'time': pa.timestamp('ns', tz='UTC'), 'vin': pa.string()})
+    sensor_table_2023 = pv.read_csv(
+        SENSOR_SOURCES[1],
+        read_options=pv.ReadOptions(use_threads=True, block_size=64 << 20),
+        convert_options=pv.ConvertOptions(
+            include_columns=csv_columns,
+            column_types=column_types,
+            timestamp_parsers=[pv.ISO8601]
+        )
+    )
+    print(f"   └─ 2023-2024 data: {sensor_table_2023.num_rows:,} points")
+    print(f"   └─ 2024-2025 data: {sensor_table_2024.num_rows:,} points")
+    
+    # Normalize timestamps to naive UTC, VINs to plain strings and readings to float32 before combining
+    tables = []
+    for table in (sensor_table_2023, sensor_table_2024):
+        schema = pa.schema([
+            pa.field(name, pa.timestamp('ns') if name == 'time' else pa.string() if name == 'vin' else pa.float32())
+            for name in table.column_names
+        ])
+        tables.append(table.cast(schema))
+    sensor_table = pa.concat_tables(tables, promote_options='default')
+    
+    # Remove duplicates based on time and vin to avoid double-counting; a hash group_by
+    # finds the earliest row of each (time, vin) pair, so the 2023-2024 reading wins
+    # as with drop_duplicates(keep='first')
+    row_ids = sensor_table.append_column('row_id', pa.array(np.arange(sensor_table.num_rows)))
+    first_rows = row_ids.group_by(['time', 'vin']).aggregate([('row_id', 'min')])['row_id_min']
+    deduped = sensor_table.take(first_rows.sort())
+    duplicates_removed = sensor_table.num_rows - deduped.num_rows
+    
+    if duplicates_removed > 0:
+        print(f"   🗑️ Removed {duplicates_removed:,} duplicate records")
+    
+    deduped = deduped.set_column(deduped.schema.get_field_index('vin'), 'vin', pc.dictionary_encode(deduped['vin']))
+    pq.write_table(deduped, SENSOR_PARQUET, compression='zstd', use_dictionary=['vin'])
+    print(f"   💾 Saved {SENSOR_PARQUET}")
 
 
 def load_dpf_datasets():
@@ -38,36 +152,22 @@ def load_dpf_datasets():
     print("📊 Loading DPF datasets...")
     
     try:
-        maintenance_df = pd.read_csv('data/dpf_maintenance_records.csv')
-        
-        # Load and combine both vehicle stats files for expanded dataset (2023-2025)
-        print("🔄 Loading vehicle stats from multiple years...")
-        sensor_df_2024 = pd.read_csv('data/dpf_vehicle_stats.csv')
-        sensor_df_2023 = pd.read_csv('data/vehicle_stats_23-24.csv')
+        # Load only the maintenance fields used downstream; dates are stored parsed
+        maintenance_path = 'data/dpf_maintenance_records.parquet'
+        maintenance_columns = [col for col in MAINTENANCE_COLUMNS if col in pq.read_schema(maintenance_path).names]
+        maintenance_df = pd.read_parquet(maintenance_path, columns=maintenance_columns)
         
-        # Combine the datasets and remove duplicates
-        sensor_df = pd.concat([sensor_df_2023, sensor_df_2024], ignore_index=True)
+        convert_csvs_to_parquet()
+        sensor_df = pd.read_parquet(SENSOR_PARQUET)
         
-        # Remove duplicates based on time and vin to avoid double-counting
-        initial_rows = len(sensor_df)
-        sensor_df = sensor_df.drop_duplicates(subset=['time', 'vin'], keep='first')
-        duplicates_removed = initial_rows - len(sensor_df)
-        
-        if duplicates_removed > 0:
-            print(f"   🗑️ Removed {duplicates_removed:,} duplicate records")
-        
-        diagnostic_df = pd.read_csv('data/dpf_diagnostic_data.csv')
+        diagnostic_df = pd.read_parquet('data/dpf_diagnostic_data.parquet')
         
         print(f"✅ Maintenance records: {len(maintenance_df):,} events")
         print(f"✅ Sensor readings (combined 2023-2025): {len(sensor_df):,} data points")
-        print(f"   └─ 2023-2024 data: {len(sensor_df_2023):,} points")
-        print(f"   └─ 2024-2025 data: {len(sensor_df_2024):,} points")
         print(f"✅ Diagnostic readings: {len(diagnostic_df):,} measurements")
         
-        # Convert time columns and inspect data quality
-        maintenance_df['Date of Issue'] = pd.to_datetime(maintenance_df['Date of Issue'])
-        sensor_df['time'] = pd.to_datetime(sensor_df['time']).dt.tz_localize(None)
-        diagnostic_df['Time'] = pd.to_datetime(diagnostic_df['Time'], errors='coerce').dt.tz_localize(None)
+        # Diagnostic times are stored timezone-aware; drop the timezone to match the other sources
+        diagnostic_df['Time'] = diagnostic_df['Time'].dt.tz_localize(None)
         
         print("\n📅 Data Time Ranges:")
         print(f"   Maintenance: {maintenance_df['Date of Issue'].min()} to {maintenance_df['Date of Issue'].max()}")
@@ -101,64 +201,47 @@ def create_backtrack_rul_labels(maintenance_df, lookback_days=[7, 15, 30, 45, 60
     - 45 days before: RUL = 45 days (LOW)
     - 60 days before: RUL = 60 days (NORMAL)
     """
-    rul_data = []
-    
     print(f"🔄 Creating backtrack RUL labels with lookback periods: {lookback_days}")
     
     total_events = len(maintenance_df)
-    successful_labels = 0
     
-    for idx, event in maintenance_df.iterrows():
-        vehicle_num = event['Vehicle_Number']
-        maintenance_date = event['Date of Issue']
-        
-        # Get all maintenance events for this vehicle to check for interference
-        vehicle_maintenance = maintenance_df[
-            maintenance_df['Vehicle_Number'] == vehicle_num
-        ].sort_values('Date of Issue')
-        
-        for days_back in lookback_days:
-            prediction_date = maintenance_date - timedelta(days=days_back)
-            
-            # Check if there are any maintenance events between prediction_date and maintenance_date
-            interfering_events = vehicle_maintenance[
-                (vehicle_maintenance['Date of Issue'] > prediction_date) &
-                (vehicle_maintenance['Date of Issue'] < maintenance_date)
-            ]
-            
-            # Only create RUL label if there's a clean window (no interfering maintenance)
-            if len(interfering_events) == 0:
-                # Assign RUL category labels
-                if days_back <= 7:
-                    rul_category = 'CRITICAL'
-                elif days_back <= 15:
-                    rul_category = 'HIGH'
-                elif days_back <= 30:
-                    rul_category = 'MEDIUM'
-                elif days_back <= 45:
-                    rul_category = 'LOW'
-                else:
-                    rul_category = 'NORMAL'
-                
-                rul_entry = {
-                    'vehicle_number': vehicle_num,
-                    'vin': event['VIN Number'],
-                    'prediction_date': prediction_date,
-                    'maintenance_date': maintenance_date,
-                    'rul_days': days_back,
-                    'rul_category': rul_category,
-                    'maintenance_type': event['lines_jobDescriptions'],
-                    'maintenance_cost': event.get('Total_Cost', 0),
-                    'downtime_days': event.get('Downtime Days', 0)
-                }
-                
-                rul_data.append(rul_entry)
-                successful_labels += 1
-        
-        if (idx + 1) % 20 == 0:
-            print(f"   Processed {idx + 1}/{total_events} maintenance events")
-    
-    rul_df = pd.DataFrame(rul_data)
+    # Events without a date cannot anchor a lookback window
+    events = maintenance_df.dropna(subset=['Date of Issue']).sort_values(['Vehicle_Number', 'Date of Issue'])
+    
+    # Most recent earlier maintenance on the same vehicle; same-day repeats are skipped
+    # since only events strictly before the maintenance date can interfere
+    prev_date = events.groupby('Vehicle_Number')['Date of Issue'].shift(1)
+    prev_date = prev_date.mask(prev_date == events['Date of Issue'])
+    events['prev_date'] = prev_date.groupby(events['Vehicle_Number']).ffill()
+    events = events.sort_index()
+    
+    # Pair every event with every lookback period by position into flat preallocated arrays
+    event_pos = np.repeat(np.arange(len(events)), len(lookback_days))
+    rul_days = np.tile(np.asarray(lookback_days, dtype=np.int16), len(events))
+    maintenance_date = events['Date of Issue'].to_numpy()[event_pos]
+    prev_date = events['prev_date'].to_numpy()[event_pos]
+    prediction_date = maintenance_date - rul_days.astype('timedelta64[D]')
+    
+    # Only create RUL label if there's a clean window (no interfering maintenance)
+    clean_window = np.isnat(prev_date) | (prev_date <= prediction_date)
+    rows = events.iloc[event_pos[clean_window]]
+    rul_days = rul_days[clean_window]
+    
+    rul_df = pd.DataFrame({
+        'vehicle_number': rows['Vehicle_Number'].array,
+        'vin': rows['VIN Number'].array,
+        'prediction_date': prediction_date[clean_window],
+        'maintenance_date': maintenance_date[clean_window],
+        'rul_days': rul_days,
+        # Assign RUL category labels
+        'rul_category': pd.cut(
+            rul_days, bins=[-np.inf, 7, 15, 30, 45, np.inf],
+            labels=['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'NORMAL']
+        ),
+        'maintenance_type': rows['lines_jobDescriptions'].array,
+        'maintenance_cost': rows['Total_Cost'].array if 'Total_Cost' in rows.columns else 0,
+        'downtime_days': rows['Downtime Days'].array if 'Downtime Days' in rows.columns else 0
+    })
     
     print(f"\n✅ Backtrack RUL Generation Results:")
     print(f"   Total maintenance events: {total_events}")
@@ -168,190 +251,258 @@ def create_backtrack_rul_labels(maintenance_df, lookback_days=[7, 15, 30, 45, 60
     return rul_df
 
 
-def calculate_explainable_features(sensor_data, window_days=30):
+@njit(parallel=True, fastmath={'reassoc', 'contract', 'arcp', 'nsz', 'afn'}, cache=True)
+def _window_features(values, starts, ends, high, low, out, counts):
     """
-    Calculate explainable time-series features for RUL prediction.
-    These features are designed to be interpretable by fleet managers.
+    For every window w (rows starts[w]:ends[w]) fill out[w, j] with the FEATURE_TYPES of sensor
+    column j and counts[w, j] with its number of non-NaN readings. Features that do not apply
+    are left as NaN. Windows are processed in parallel.
     """
-    features = {}
-    
-    # Expanded sensors for comprehensive DPF health monitoring
-    key_sensors = [
-        # Engine Performance Metrics
-        'engineLoadPercent', 'engineRpm', 'ecuSpeedMph',
-        'engineOilPressureKPa', 'engineCoolantTemperatureMilliC',
-        
-        # Fuel & Emissions System
-        'defLevelMilliPercent', 'fuelPercents',
-        
-        # Environmental & Operational
-        'ambientAirTemperatureMilliC', 'intakeManifoldTemperatureMilliC',
-        'barometricPressurePa', 'obdEngineSeconds',
-        
-        # Distance & Usage Patterns
-        'gpsDistanceMeters',
-        
-        # Additional diagnostic parameters that may be available
-        'exhaustTemperature', 'dpfPressureDifferential', 'sootLevel',
-        'regenCycles', 'turbochargerPressure', 'airFlowMass'
-    ]
-    
-    for sensor in key_sensors:
-        if sensor not in sensor_data.columns:
-            continue
-            
-        values = sensor_data[sensor].dropna()
-        if len(values) < 3:  # Need minimum data points
-            continue
-            
-        # 1. TREND ANALYSIS FEATURES (Easy to explain)
-        
-        # Linear trend slope (positive = increasing, negative = decreasing)
-        x = np.arange(len(values))
-        if len(values) > 1:
-            try:
-                slope = np.polyfit(x, values, 1)[0]
-                features[f'{sensor}_trend_slope'] = slope
-            except:
-                features[f'{sensor}_trend_slope'] = 0.0
-        
-        # Trend strength (R-squared of linear fit)
-        if len(values) > 2:
-            try:
-                correlation = np.corrcoef(x, values)[0, 1] ** 2
-                if np.isfinite(correlation):
-                    features[f'{sensor}_trend_strength'] = correlation
-            except:
-                pass
-        
-        # Volatility (coefficient of variation)
-        if values.mean() != 0 and values.std() > 0:
-            cv = values.std() / abs(values.mean())
-            features[f'{sensor}_volatility'] = cv
-        
-        # 2. THRESHOLD-BASED FEATURES (Actionable alerts)
-        
-        # Define sensor-specific thresholds (based on operational knowledge)
-        thresholds = {
-            # Engine Performance
-            'engineLoadPercent': {'high': 80, 'low': 10},
-            'engineRpm': {'high': 2000, 'low': 500},
-            'ecuSpeedMph': {'high': 70, 'low': 5},
+    n_sensors = values.shape[1]
+    for w in prange(len(starts)):
+        lo = starts[w]
+        hi = ends[w]
+        for j in range(n_sensors):
+            out[w, j, :] = np.nan
             
-            # Fluid Systems
-            'defLevelMilliPercent': {'high': 95000, 'low': 50000},
-            'fuelPercents': {'high': 95, 'low': 25},
-            'engineOilPressureKPa': {'high': 500, 'low': 200},
+            count = 0
+            total = 0.0
+            for i in range(lo, hi):
+                if not np.isnan(values[i, j]):
+                    count += 1
+                    total += values[i, j]
+            counts[w, j] = count
+            if count < 3:  # Need minimum data points
+                continue
             
-            # Temperature Systems
-            'engineCoolantTemperatureMilliC': {'high': 95000, 'low': 70000},
-            'ambientAirTemperatureMilliC': {'high': 40000, 'low': -10000},
-            'intakeManifoldTemperatureMilliC': {'high': 60000, 'low': 15000},
+            mean = total / count
+            x_mean = (count - 1) / 2.0
+            split_point = max(1, int(count * 0.75))
             
-            # Pressure & Environmental
-            'barometricPressurePa': {'high': 102000, 'low': 98000},
+            # Single pass for the regression sums, threshold counts and the historical sum
+            sxx = 0.0
+            sxy = 0.0
+            syy = 0.0
+            historical_total = 0.0
+            n_high = 0
+            n_low = 0
+            k = 0
+            for i in range(lo, hi):
+                v = values[i, j]
+                if np.isnan(v):
+                    continue
+                dx = k - x_mean
+                dy = v - mean
+                sxx += dx * dx
+                sxy += dx * dy
+                syy += dy * dy
+                if k < split_point:
+                    historical_total += v
+                # Branchless threshold counts; comparisons against a NaN threshold are False
+                n_high += v > high[j]
+                n_low += v < low[j]
+                k += 1
             
-            # Usage Patterns
-            'obdEngineSeconds': {'high': 36000, 'low': 3600}  # 10 hours to 1 hour daily
-        }
-        
-        if sensor in thresholds:
-            high_thresh = thresholds[sensor]['high']
-            low_thresh = thresholds[sensor]['low']
+            # 1. TREND ANALYSIS FEATURES: closed-form degree-1 fit slope and R-squared
+            out[w, j, 0] = sxy / sxx
+            if syy > 0:
+                out[w, j, 1] = sxy * sxy / (sxx * syy)
             
-            # Percentage of time above/below thresholds
-            pct_high = (values > high_thresh).mean() * 100
-            pct_low = (values < low_thresh).mean() * 100
+            # Volatility (coefficient of variation)
+            std = np.sqrt(syy / (count - 1))
+            if mean != 0 and std > 0:
+                out[w, j, 2] = std / abs(mean)
             
-            features[f'{sensor}_pct_time_high'] = pct_high
-            features[f'{sensor}_pct_time_low'] = pct_low
-        
-        # 3. OPERATIONAL PATTERN FEATURES
-        
-        # Recent vs historical comparison (last 25% vs first 75%)
-        split_point = max(1, int(len(values) * 0.75))
-        if split_point > 0 and split_point < len(values):
-            historical_mean = values[:split_point].mean()
-            recent_mean = values[split_point:].mean()
+            # 2. THRESHOLD-BASED FEATURES: percentage of time above/below thresholds
+            if not np.isnan(high[j]):
+                out[w, j, 3] = n_high / count * 100
+                out[w, j, 4] = n_low / count * 100
             
-            if historical_mean != 0 and np.isfinite(historical_mean) and np.isfinite(recent_mean):
-                pattern_change = (recent_mean - historical_mean) / abs(historical_mean) * 100
-                features[f'{sensor}_pattern_change_pct'] = pattern_change
+            # 3. OPERATIONAL PATTERN FEATURES: recent vs historical comparison (last 25% vs first 75%)
+            if split_point < count:
+                historical_mean = historical_total / split_point
+                recent_mean = (total - historical_total) / (count - split_point)
+                if historical_mean != 0 and np.isfinite(historical_mean) and np.isfinite(recent_mean):
+                    out[w, j, 5] = (recent_mean - historical_mean) / abs(historical_mean) * 100
+
+
+def calculate_explainable_features(values, starts, ends, high, low, feature_names, window_days=30):
+    """
+    Calculate explainable time-series features for RUL prediction.
+    These features are designed to be interpretable by fleet managers.
+    
+    values is a float32 (readings x sensors) array and each window is the row range
+    starts[w]:ends[w]; high/low are the aligned thresholds and feature_names lists the
+    '{sensor}_{feature_type}' name of each kernel output. Returns one row per window.
+    """
+    out = np.empty((len(starts), values.shape[1], len(FEATURE_TYPES)))
+    counts = np.empty((len(starts), values.shape[1]), dtype=np.int64)
+    _window_features(values, starts, ends, high, low, out, counts)
+    
+    features = pd.DataFrame(out.reshape(len(starts), -1), columns=feature_names).dropna(axis=1, how='all')
     
-    # Add basic features if no sensor-specific features were found
-    if not features:
-        # Add basic data availability features
-        features['data_availability'] = len(sensor_data) / max(1, window_days)
-        features['sensor_count'] = sum(1 for sensor in key_sensors if sensor in sensor_data.columns and sensor_data[sensor].notna().any())
+    # Add basic data availability features where no sensor-specific features were found
+    no_features = features.isna().all(axis=1).to_numpy()
+    if no_features.any():
+        features.loc[no_features, 'data_availability'] = (ends - starts)[no_features] / max(1, window_days)
+        features.loc[no_features, 'sensor_count'] = (counts[no_features] > 0).sum(axis=1)
     
     return features
 
 
+def locate_feature_windows(windows, sensor_df):
+    """
+    Map each [feature_start, feature_end) window to row positions in sensor_df sorted by (vin, time).
+    Each vin's block of rows is located once, then window bounds are binary-searched within it.
+    """
+    times = sensor_df['time'].to_numpy()
+    vins = sensor_df['vin']
+    block_starts = np.flatnonzero((vins != vins.shift()).to_numpy())
+    block_ends = np.append(block_starts[1:], len(vins))
+    vin_blocks = dict(zip(vins.iloc[block_starts], zip(block_starts, block_ends)))
+    
+    feature_start = windows['feature_start'].to_numpy()
+    feature_end = windows['feature_end'].to_numpy()
+    start_pos = np.zeros(len(windows), dtype=np.int64)
+    end_pos = np.zeros(len(windows), dtype=np.int64)
+    
+    for vin, positions in windows.groupby('vin', observed=True, sort=False).indices.items():
+        if vin not in vin_blocks:
+            continue
+        lo, hi = vin_blocks[vin]
+        block_times = times[lo:hi]
+        start_pos[positions] = lo + np.searchsorted(block_times, feature_start[positions])
+        end_pos[positions] = lo + np.searchsorted(block_times, feature_end[positions])
+    
+    return start_pos, end_pos
+
+
+def rul_features_cache_path(rul_df, sensor_df, window_days):
+    """Cache file for build_rul_dataset, keyed by its inputs, the sensors present and the feature definitions."""
+    present_sensors = [sensor for sensor in KEY_SENSORS if sensor in sensor_df.columns]
+    key = repr((
+        sensor_df.shape, sensor_df['time'].min(), sensor_df['time'].max(), present_sensors,
+        int(pd.util.hash_pandas_object(rul_df, index=False).sum()), window_days,
+        KEY_SENSORS, FEATURE_TYPES, SENSOR_THRESHOLDS
+    ))
+    return RUL_CACHE_DIR / f"rul_features_{hashlib.sha1(key.encode()).hexdigest()[:12]}.parquet"
+
+
 def build_rul_dataset(rul_df, sensor_df, window_days=30):
     """
     Build RUL dataset with explainable features.
     For each RUL example, extract features from sensor data before the maintenance event.
     """
-    rul_features = []
+    # Reuse features extracted by an earlier run on the same inputs
+    cache_path = rul_features_cache_path(rul_df, sensor_df, window_days)
+    if cache_path.exists():
+        print(f"📦 Using cached RUL features from {cache_path}")
+        return pd.read_parquet(cache_path)
     
     print(f"🔄 Processing {len(rul_df)} RUL examples...")
     
-    successful_extractions = 0
-    
-    for idx, row in rul_df.iterrows():
-        try:
-            vin = row['vin']
-            prediction_date = row['prediction_date']
-            rul_days = row['rul_days']
-            
-            # Extract sensor data from BEFORE the prediction date to avoid data leakage
-            feature_end_date = prediction_date
-            feature_start_date = prediction_date - timedelta(days=window_days)
-            
-            vehicle_sensors = sensor_df[
-                (sensor_df['vin'] == vin) &
-                (sensor_df['time'] >= feature_start_date) &
-                (sensor_df['time'] < feature_end_date)
-            ].copy()
-            
-            if len(vehicle_sensors) < 5:  # Need minimum data
-                continue
-            
-            # Calculate explainable features
-            features = calculate_explainable_features(vehicle_sensors, window_days)
-            
-            # Add metadata
-            features['vehicle_number'] = row['vehicle_number']
-            features['vin'] = vin
-            features['prediction_date'] = prediction_date
-            features['maintenance_date'] = row['maintenance_date']
-            features['rul_days'] = rul_days
-            features['rul_category'] = row['rul_category']
-            features['maintenance_type'] = row['maintenance_type']
-            features['data_points'] = len(vehicle_sensors)
-            features['window_days'] = window_days
-            
-            rul_features.append(features)
-            successful_extractions += 1
-            
-            if (idx + 1) % 50 == 0:
-                print(f"   Processed {idx + 1}/{len(rul_df)} examples ({successful_extractions} successful)")
-                
-        except Exception as e:
-            continue
-    
-    if successful_extractions == 0:
+    # Sort readings once by (vin, time) so every feature window is a contiguous slice
+    sensor_df = sensor_df.sort_values(['vin', 'time'], ignore_index=True)
+    
+    # Extract sensor data from BEFORE the prediction date to avoid data leakage
+    windows = rul_df[['vin', 'prediction_date']].dropna()
+    windows = pd.DataFrame({
+        'vin': windows['vin'].astype(sensor_df['vin'].dtype),
+        'feature_start': windows['prediction_date'] - timedelta(days=window_days),
+        'feature_end': windows['prediction_date']
+    })
+    start_pos, end_pos = locate_feature_windows(windows, sensor_df)
+    
+    # Need minimum data
+    enough_data = (end_pos - start_pos) >= 5
+    if not enough_data.any():
         print("❌ No successful feature extractions. Check sensor data availability.")
         return pd.DataFrame()
+    start_pos, end_pos = start_pos[enough_data], end_pos[enough_data]
+    labels = rul_df.loc[windows.index[enough_data]]
+    
+    # Sensor readings as one float32 array; windows are row slices of it. Column-major
+    # order keeps each sensor's readings contiguous for the kernel's per-sensor passes
+    present_idx = [i for i, sensor in enumerate(KEY_SENSORS) if sensor in sensor_df.columns]
+    present_sensors = [KEY_SENSORS[i] for i in present_idx]
+    sensor_values = np.asfortranarray(sensor_df[present_sensors].to_numpy(dtype=np.float32))
+    high = SENSOR_HIGH[present_idx]
+    low = SENSOR_LOW[present_idx]
+    feature_names = [f'{sensor}_{feature_type}' for sensor in present_sensors for feature_type in FEATURE_TYPES]
+    
+    # Calculate explainable features for all windows in one batched kernel call; the kernel
+    # spreads windows across all cores with prange, so no per-VIN process pool is needed
+    result_df = calculate_explainable_features(sensor_values, start_pos, end_pos, high, low, feature_names, window_days)
+    
+    # Add metadata
+    result_df['vehicle_number'] = labels['vehicle_number'].to_numpy()
+    result_df['vin'] = labels['vin'].to_numpy()
+    result_df['prediction_date'] = labels['prediction_date'].to_numpy()
+    result_df['maintenance_date'] = labels['maintenance_date'].to_numpy()
+    result_df['rul_days'] = labels['rul_days'].to_numpy()
+    result_df['rul_category'] = labels['rul_category'].array
+    result_df['maintenance_type'] = labels['maintenance_type'].to_numpy()
+    result_df['data_points'] = end_pos - start_pos
+    result_df['window_days'] = window_days
+    
+    # Compact dtypes: float32 features and categorical labels halve the frame for later scans
+    float_cols = result_df.select_dtypes('float').columns
+    result_df[float_cols] = result_df[float_cols].astype('float32')
+    for col in ['rul_category', 'maintenance_type', 'vin']:
+        result_df[col] = result_df[col].astype('category')
     
-    result_df = pd.DataFrame(rul_features)
     print(f"\n✅ Successfully created RUL dataset with {len(result_df)} examples")
     print(f"📊 Success rate: {len(result_df)}/{len(rul_df)} ({len(result_df)/len(rul_df):.1%})")
     print(f"🎯 RUL range: {result_df['rul_days'].min()}-{result_df['rul_days'].max()} days")
     
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(result_df, preserve_index=False)
+    pq.write_table(table, cache_path, compression='zstd', row_group_size=64_000)
+    
     return result_df
 
 
+def correlations_with_target(X, y):
+    """
+    Pearson correlation of every column of X with y, over the rows where both are present.
+    Computed as one vectorized pass over the centered arrays instead of a per-column loop.
+    """
+    Xv = X.to_numpy(dtype=np.float64)
+    yv = y.to_numpy(dtype=np.float64)[:, None]
+    valid = ~np.isnan(Xv) & ~np.isnan(yv)
+    n = valid.sum(axis=0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(valid, Xv, 0).sum(axis=0) / n
+        y_mean = np.where(valid, yv, 0).sum(axis=0) / n
+        Xc = np.where(valid, Xv - x_mean, 0)
+        yc = np.where(valid, yv - y_mean, 0)
+        r = (Xc * yc).sum(axis=0) / np.sqrt((Xc * Xc).sum(axis=0) * (yc * yc).sum(axis=0))
+    
+    return pd.Series(r, index=X.columns)
+
+
+class LinReg:
+    """
+    Ordinary least squares with intercept, solved from the normal equations.
+    Exposes the coef_/intercept_/predict interface of sklearn's LinearRegression
+    without its validation overhead, which dominates on a handful of features.
+    """
+    
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        x_mean = X.mean(axis=0)
+        y_mean = y.mean()
+        Xc = X - x_mean
+        self.coef_ = np.linalg.solve(Xc.T @ Xc + 1e-8 * np.eye(X.shape[1]), Xc.T @ (y - y_mean))
+        self.intercept_ = y_mean - self.coef_ @ x_mean
+        return self
+    
+    def predict(self, X):
+        return np.asarray(X) @ self.coef_ + self.intercept_
+
+
 def build_explainable_rul_model(rul_feature_df, max_features=5):
     """
     Build an explainable RUL prediction model using only the most important features.
@@ -381,7 +532,7 @@ def build_explainable_rul_model(rul_feature_df, max_features=5):
     print(f"📊 Building model with {len(X)} examples and {len(feature_cols)} features")
     
     # Select top features based on correlation
-    correlations = X.corrwith(y).abs().sort_values(ascending=False)
+    correlations = correlations_with_target(X, y).abs().sort_values(ascending=False)
     top_features = correlations.head(max_features).index.tolist()
     
     print(f"\n🎯 Selected Top {len(top_features)} Explainable Features:")
@@ -390,7 +541,7 @@ def build_explainable_rul_model(rul_feature_df, max_features=5):
         print(f"   {i+1}. {feature}: {corr:.3f} correlation")
     
     # Train model with selected features
-    X_selected = X[top_features]
+    X_selected = X[top_features].to_numpy(dtype=np.float32)
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -403,7 +554,7 @@ def build_explainable_rul_model(rul_feature_df, max_features=5):
     X_test_scaled = scaler.transform(X_test)
     
     # Train linear regression model
-    model = LinearRegression()
+    model = LinReg()
     model.fit(X_train_scaled, y_train)
     
     # Evaluate model
@@ -430,8 +581,114 @@ def build_explainable_rul_model(rul_feature_df, max_features=5):
     return model, scaler, top_features
 
 
-def analyze_explainable_features(rul_feature_df):
-    """Analyze and visualize the most explainable features."""
+def _maybe_import_plt():
+    """Import and configure matplotlib/seaborn on first use so headless runs skip the import."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # Set up plotting
+    plt.style.use('default')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (12, 6)
+    return plt
+
+
+def _compute_feature_stats(rul_feature_df, feature_cols):
+    """Correlation of each explainable feature with RUL, strongest first."""
+    correlations = correlations_with_target(rul_feature_df[feature_cols], rul_feature_df['rul_days'])
+    return correlations.sort_values(key=abs, ascending=False)
+
+
+def _render_feature_plots(rul_feature_df, correlations):
+    """Render the RUL distribution, correlation heatmap and top-feature quartile plots."""
+    plt = _maybe_import_plt()
+    
+    # 1. RUL Distribution by Category
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+    fig.suptitle('Enhanced RUL Analysis: Distribution, Patterns & Insights', fontsize=16)
+
+    # Plot 1: RUL Distribution by Category
+    ax1 = axes[0, 0]
+    rul_categories = rul_feature_df['rul_category'].value_counts().sort_index()
+    colors = ['#ff4444', '#ff8800', '#ffcc00', '#88dd00', '#00dd88']
+    bars = ax1.bar(rul_categories.index, rul_categories.values, color=colors)
+    ax1.set_title('RUL Distribution by Risk Category')
+    ax1.set_ylabel('Number of Examples')
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'{int(height)}', ha='center', va='bottom')
+
+    # Plot 2: RUL Days Histogram
+    ax2 = axes[0, 1]
+    ax2.hist(rul_feature_df['rul_days'], bins=20, alpha=0.7, color='steelblue', edgecolor='black')
+    ax2.axvline(rul_feature_df['rul_days'].mean(), color='red', linestyle='--', 
+               label=f'Mean: {rul_feature_df["rul_days"].mean():.1f} days')
+    ax2.set_title('RUL Days Distribution')
+    ax2.set_xlabel('Days Until Maintenance')
+    ax2.set_ylabel('Frequency')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+    # Plot 3: Feature Correlation Heatmap (Top 10)
+    ax3 = axes[0, 2]
+    top_10_features = correlations.head(10).index
+    if len(top_10_features) > 1:
+        # Only this 11x11 submatrix is needed; per-feature RUL correlations come from correlations_with_target
+        corr_matrix = rul_feature_df[list(top_10_features) + ['rul_days']].corr()
+        im = ax3.imshow(corr_matrix.values, cmap='RdBu_r', vmin=-1, vmax=1)
+        ax3.set_xticks(range(len(corr_matrix.columns)))
+        ax3.set_yticks(range(len(corr_matrix.columns)))
+        ax3.set_xticklabels([col.split('_')[0][:8] for col in corr_matrix.columns], rotation=45)
+        ax3.set_yticklabels([col.split('_')[0][:8] for col in corr_matrix.columns])
+        ax3.set_title('Feature Correlation Heatmap')
+        plt.colorbar(im, ax=ax3, shrink=0.8)
+
+    # Plot 4-6: Top 3 Feature Relationships with Binned Analysis
+    top_3_features = correlations.head(3).index
+
+    for i, feature in enumerate(top_3_features):
+        ax = axes[1, i]
+
+        # Create binned analysis instead of scatter
+        feature_data = rul_feature_df[feature].to_numpy()
+        present = ~np.isnan(feature_data)
+        feature_data = feature_data[present]
+        rul_data = rul_feature_df['rul_days'].to_numpy()[present]
+
+        # Bin the feature values into quartiles (right-inclusive, as pd.qcut would)
+        quartiles = np.quantile(feature_data, [0.25, 0.5, 0.75])
+        bins = np.searchsorted(quartiles, feature_data)
+
+        # Box plot by quartiles
+        rul_by_quartile = [rul_data[bins == q] for q in range(4)]
+        box_plot = ax.boxplot(rul_by_quartile, tick_labels=['Q1\n(Low)', 'Q2', 'Q3', 'Q4\n(High)'], 
+                             patch_artist=True)
+
+        # Color the boxes
+        colors_box = ['lightblue', 'lightgreen', 'lightyellow', 'lightcoral']
+        for patch, color in zip(box_plot['boxes'], colors_box):
+            patch.set_facecolor(color)
+
+        ax.set_title(f'{feature.split("_")[0]} - {"_".join(feature.split("_")[1:])}')
+        ax.set_ylabel('RUL (Days)')
+        ax.set_xlabel('Feature Quartile')
+        ax.grid(True, alpha=0.3)
+
+        # Add correlation as text
+        ax.text(0.02, 0.98, f'Correlation: {correlations[feature]:+.3f}', 
+               transform=ax.transAxes, verticalalignment='top',
+               bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+    plt.tight_layout()
+    plt.show()
+
+
+def analyze_explainable_features(rul_feature_df, plot=False):
+    """Analyze the most explainable features; plot=True also renders the visualization suite."""
     feature_cols = [col for col in rul_feature_df.columns if col.endswith((
         '_trend_slope', '_volatility', '_pct_time_high', '_pct_time_low', '_pattern_change_pct'
     ))]
@@ -440,8 +697,7 @@ def analyze_explainable_features(rul_feature_df):
         print("🔍 Analyzing Explainable Features...")
         
         # Correlation with RUL
-        correlations = rul_feature_df[feature_cols + ['rul_days']].corr()['rul_days'].drop('rul_days')
-        correlations = correlations.sort_values(key=abs, ascending=False)
+        correlations = _compute_feature_stats(rul_feature_df, feature_cols)
         
         print(f"\n📈 Top 10 Features Most Predictive of RUL:")
         for i, (feature, corr) in enumerate(correlations.head(10).items()):
@@ -468,93 +724,8 @@ def analyze_explainable_features(rul_feature_df):
 
         # Create comprehensive visualization suite
         if len(correlations) > 0:
-            # 1. RUL Distribution by Category
-            fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-            fig.suptitle('Enhanced RUL Analysis: Distribution, Patterns & Insights', fontsize=16)
-            
-            # Plot 1: RUL Distribution by Category
-            ax1 = axes[0, 0]
-            rul_categories = rul_feature_df['rul_category'].value_counts().sort_index()
-            colors = ['#ff4444', '#ff8800', '#ffcc00', '#88dd00', '#00dd88']
-            bars = ax1.bar(rul_categories.index, rul_categories.values, color=colors)
-            ax1.set_title('RUL Distribution by Risk Category')
-            ax1.set_ylabel('Number of Examples')
-            ax1.tick_params(axis='x', rotation=45)
-            
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                        f'{int(height)}', ha='center', va='bottom')
-            
-            # Plot 2: RUL Days Histogram
-            ax2 = axes[0, 1]
-            ax2.hist(rul_feature_df['rul_days'], bins=20, alpha=0.7, color='steelblue', edgecolor='black')
-            ax2.axvline(rul_feature_df['rul_days'].mean(), color='red', linestyle='--', 
-                       label=f'Mean: {rul_feature_df["rul_days"].mean():.1f} days')
-            ax2.set_title('RUL Days Distribution')
-            ax2.set_xlabel('Days Until Maintenance')
-            ax2.set_ylabel('Frequency')
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-            
-            # Plot 3: Feature Correlation Heatmap (Top 10)
-            ax3 = axes[0, 2]
-            top_10_features = correlations.head(10).index
-            if len(top_10_features) > 1:
-                corr_matrix = rul_feature_df[list(top_10_features) + ['rul_days']].corr()
-                im = ax3.imshow(corr_matrix.values, cmap='RdBu_r', vmin=-1, vmax=1)
-                ax3.set_xticks(range(len(corr_matrix.columns)))
-                ax3.set_yticks(range(len(corr_matrix.columns)))
-                ax3.set_xticklabels([col.split('_')[0][:8] for col in corr_matrix.columns], rotation=45)
-                ax3.set_yticklabels([col.split('_')[0][:8] for col in corr_matrix.columns])
-                ax3.set_title('Feature Correlation Heatmap')
-                plt.colorbar(im, ax=ax3, shrink=0.8)
-            
-            # Plot 4-6: Top 3 Feature Relationships with Binned Analysis
-            top_3_features = correlations.head(3).index
-            
-            for i, feature in enumerate(top_3_features):
-                ax = axes[1, i]
-                
-                # Create binned analysis instead of scatter
-                feature_data = rul_feature_df[feature].dropna()
-                rul_data = rul_feature_df.loc[feature_data.index, 'rul_days']
-                
-                # Bin the feature values into quartiles
-                try:
-                    feature_data_binned = pd.qcut(feature_data, q=4, labels=['Q1', 'Q2', 'Q3', 'Q4'])
-                    
-                    # Box plot by quartiles
-                    rul_by_quartile = [rul_data[feature_data_binned == q] for q in ['Q1', 'Q2', 'Q3', 'Q4']]
-                    box_plot = ax.boxplot(rul_by_quartile, labels=['Q1\n(Low)', 'Q2', 'Q3', 'Q4\n(High)'], 
-                                         patch_artist=True)
-                    
-                    # Color the boxes
-                    colors_box = ['lightblue', 'lightgreen', 'lightyellow', 'lightcoral']
-                    for patch, color in zip(box_plot['boxes'], colors_box):
-                        patch.set_facecolor(color)
-                    
-                    ax.set_title(f'{feature.split("_")[0]} - {"_".join(feature.split("_")[1:])}')
-                    ax.set_ylabel('RUL (Days)')
-                    ax.set_xlabel('Feature Quartile')
-                    ax.grid(True, alpha=0.3)
-                    
-                    # Add correlation as text
-                    ax.text(0.02, 0.98, f'Correlation: {correlations[feature]:+.3f}', 
-                           transform=ax.transAxes, verticalalignment='top',
-                           bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-                    
-                except Exception:
-                    # Fallback to scatter plot if binning fails
-                    ax.scatter(feature_data, rul_data, alpha=0.6)
-                    ax.set_xlabel(feature.replace('_', ' ').title())
-                    ax.set_ylabel('RUL (Days)')
-                    ax.set_title(f'Correlation: {correlations[feature]:+.3f}')
-                    ax.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            plt.show()
+            if plot:
+                _render_feature_plots(rul_feature_df, correlations)
             
             print("💡 Enhanced Interpretation Guide:")
             print("   📊 RUL Categories: CRITICAL(≤7d) → HIGH(≤15d) → MEDIUM(≤30d) → LOW(≤45d) → NORMAL(≤60d)")
@@ -565,7 +736,7 @@ def analyze_explainable_features(rul_feature_df):
             
             # Add RUL category insights
             print(f"\n🔍 RUL Category Insights:")
-            category_stats = rul_feature_df.groupby('rul_category')['rul_days'].agg(['count', 'mean', 'std']).round(1)
+            category_stats = rul_feature_df.groupby('rul_category', observed=True)['rul_days'].agg(['count', 'mean', 'std']).round(1)
             for category, stats in category_stats.iterrows():
                 print(f"   {category}: {stats['count']} examples, avg {stats['mean']} days (±{stats['std']})")
 
@@ -585,18 +756,20 @@ def analyze_rul_patterns_by_category(rul_feature_df):
     
     categories = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'NORMAL']
     
+    # Find distinguishing features for every category in one groupby pass
+    grouped = rul_feature_df.groupby('rul_category', observed=True)
+    category_sizes = grouped.size()
+    category_means = grouped[feature_cols].mean()
+    overall_means = rul_feature_df[feature_cols].mean()
+    category_differences = ((category_means - overall_means) / overall_means * 100).fillna(0)
+    
     for category in categories:
-        category_data = rul_feature_df[rul_feature_df['rul_category'] == category]
-        
-        if len(category_data) == 0:
+        if category not in category_differences.index:
             continue
             
-        print(f"\n🚨 {category} Risk Pattern ({len(category_data)} examples):")
+        print(f"\n🚨 {category} Risk Pattern ({category_sizes[category]} examples):")
         
-        # Find distinguishing features for this category
-        category_means = category_data[feature_cols].mean()
-        overall_means = rul_feature_df[feature_cols].mean()
-        differences = ((category_means - overall_means) / overall_means * 100).fillna(0)
+        differences = category_differences.loc[category]
         
         # Show top 3 distinguishing features
         top_differences = differences.abs().nlargest(3)
@@ -662,7 +835,7 @@ def print_model_summary(model, scaler, selected_features):
     print(f"   Ready for deployment in fleet management system")
 
 
-def main():
+def main(plot=False):
     """Main analysis pipeline."""
     print("🚀 Explainable DPF RUL Analysis")
     print("="*50)
@@ -685,7 +858,7 @@ def main():
         return
     
     # Analyze explainable features
-    analyze_explainable_features(rul_feature_df)
+    analyze_explainable_features(rul_feature_df, plot=plot)
     
     # Analyze RUL patterns by category for actionable insights
     analyze_rul_patterns_by_category(rul_feature_df)
@@ -698,4 +871,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Explainable DPF RUL analysis")
+    parser.add_argument('--plot', action='store_true', help="render the feature analysis plots")
+    args = parser.parse_args()
+    main(plot=args.plot)
\ No newline at end of file
@@ -3,28 +3,128 @@ Data exploration script for DPF maintenance analysis
 Explores patterns in vehicle sensor data leading to maintenance events
 """
 
+import argparse
 import pandas as pd
 import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from numba import njit, prange
 import matplotlib.pyplot as plt
 import seaborn as sns
-from datetime import datetime, timedelta
 
-def load_processed_data():
-    """Load the processed DPF datasets"""
+MAINTENANCE_PATH = 'data/dpf_maintenance_records.parquet'
+VEHICLE_STATS_PATH = 'data/dpf_vehicle_stats.parquet'
+DIAGNOSTIC_PATH = 'data/dpf_diagnostic_data.parquet'
+
+# Datasets returned by load_processed_data, and the ones each analysis step needs;
+# availability is counted straight from the vehicle stats Parquet file
+DATASETS = ['maintenance', 'vehicle_stats', 'diagnostic']
+ANALYSES = {
+    'maintenance': ['maintenance'],
+    'availability': [],
+    'diagnostics': ['diagnostic'],
+    'timing': ['maintenance', 'vehicle_stats']
+}
+
+# Columns read by the exploration steps; Parquet only decodes the columns requested
+MAINTENANCE_COLUMNS = ['VIN Number', 'Vehicle_Number', 'Date of Issue', 'lines_jobDescriptions', 'Total_Cost', 'Downtime Days']
+DIAGNOSTIC_COLUMNS = ['Asset Name', 'Diagnostic', 'Value', 'Unit']
+
+# Highly repetitive identifiers and labels, stored as category codes so comparisons,
+# groupby and value_counts work on small integers instead of hashing strings
+MAINTENANCE_CATEGORIES = ['VIN Number', 'Vehicle_Number', 'lines_jobDescriptions']
+
+# Per-job-type summaries of the maintenance cost and downtime columns
+JOB_TYPE_STATS = {
+    'Total_Cost': ['count', 'mean', 'std', 'min', 'max'],
+    'Downtime Days': ['mean', 'std', 'min', 'max']
+}
+
+# DPF-relevant sensors considered for the maintenance timing analysis
+KEY_SENSORS = [
+    'engineLoadPercent', 'engineRpm', 'ecuSpeedMph', 
+    'engineOilPressureKPa', 'engineCoolantTemperatureMilliC',
+    'ambientAirTemperatureMilliC', 'intakeManifoldTemperatureMilliC',
+    'barometricPressurePa', 'fuelPercents', 'defLevelMilliPercent'
+]
+
+# Per-sensor statistics computed over each pre-maintenance window, besides the reading count
+WINDOW_STATS = ['mean', 'std', 'min', 'max']
+
+# Prepared frames, reused until the Parquet file they were built from changes
+CACHE_DIR = Path('data/cache')
+
+def parquet_columns(path, columns):
+    """Requested columns that exist in a Parquet file, in file order"""
+    return [col for col in pq.read_schema(path).names if col in columns]
+
+def cached_feather(source, feather_path, prepare, columns=None):
+    """Load a Feather cache if it is newer than its source, else prepare the frame from the source and cache it"""
+    feather_path = Path(feather_path)
+    if feather_path.exists() and feather_path.stat().st_mtime >= Path(source).stat().st_mtime:
+        if columns is not None:
+            columns = [col for col in pa.ipc.open_file(feather_path).schema.names if col in columns]
+        return pd.read_feather(feather_path, columns=columns)
+    
+    df = prepare(source)
+    feather_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_feather(feather_path, compression='lz4')
+    return df if columns is None else df[[col for col in df.columns if col in columns]]
+
+def prepare_maintenance(path):
+    """Maintenance records with naive dates and categorical identifiers"""
+    dpf_maintenance = pd.read_parquet(path, columns=parquet_columns(path, MAINTENANCE_COLUMNS))
+    
+    # Timestamps are stored natively in Parquet, so only the timezone needs dropping
+    dpf_maintenance['Date of Issue'] = dpf_maintenance['Date of Issue'].dt.tz_localize(None)
+    return dpf_maintenance.astype({col: 'category' for col in MAINTENANCE_CATEGORIES if col in dpf_maintenance.columns})
+
+def prepare_vehicle_stats(path):
+    """Vehicle stats with naive times, categorical VINs and float32 key sensor readings"""
+    dpf_vehicle_stats = pd.read_parquet(path, columns=parquet_columns(path, ['time', 'vin'] + KEY_SENSORS))
+    dpf_vehicle_stats['time'] = dpf_vehicle_stats['time'].dt.tz_localize(None)
+    dpf_vehicle_stats['vin'] = dpf_vehicle_stats['vin'].astype('category')
+    
+    # Sensor readings only feed summary statistics, so single precision halves the bytes scanned
+    sensor_cols = [col for col in KEY_SENSORS if col in dpf_vehicle_stats.columns]
+    dpf_vehicle_stats[sensor_cols] = dpf_vehicle_stats[sensor_cols].astype('float32')
+    return dpf_vehicle_stats
+
+def prepare_diagnostic(path):
+    """Diagnostic readings with categorical diagnostic names"""
+    dpf_diagnostic = pd.read_parquet(path, columns=parquet_columns(path, DIAGNOSTIC_COLUMNS))
+    dpf_diagnostic['Diagnostic'] = dpf_diagnostic['Diagnostic'].astype('category')
+    return dpf_diagnostic
+
+def load_processed_data(sensors=None, datasets=DATASETS):
+    """
+    Load the processed DPF datasets, optionally limiting vehicle stats to the given sensors.
+    Datasets not listed in datasets are skipped and returned as None.
+    """
     print("Loading processed DPF datasets...")
     
-    dpf_maintenance = pd.read_csv('data/dpf_maintenance_records.csv')
-    dpf_vehicle_stats = pd.read_csv('data/dpf_vehicle_stats.csv')
-    dpf_diagnostic = pd.read_csv('data/dpf_diagnostic_data.csv')
+    stats_columns = None if sensors is None else ['time', 'vin'] + list(sensors)
+    loaders = {
+        'maintenance': (MAINTENANCE_PATH, CACHE_DIR / 'exploration_maintenance.feather', prepare_maintenance, None),
+        'vehicle_stats': (VEHICLE_STATS_PATH, CACHE_DIR / 'exploration_vehicle_stats.feather', prepare_vehicle_stats, stats_columns),
+        'diagnostic': (DIAGNOSTIC_PATH, CACHE_DIR / 'exploration_diagnostic.feather', prepare_diagnostic, None)
+    }
     
-    # Convert time columns and handle timezone
-    dpf_maintenance['Date of Issue'] = pd.to_datetime(dpf_maintenance['Date of Issue']).dt.tz_localize(None)
-    dpf_vehicle_stats['time'] = pd.to_datetime(dpf_vehicle_stats['time']).dt.tz_localize(None)
-    dpf_diagnostic['Time'] = pd.to_datetime(dpf_diagnostic['Time'], errors='coerce')
+    # The loads are independent and Arrow decodes without holding the GIL, so overlap them
+    with ThreadPoolExecutor(max_workers=len(DATASETS)) as executor:
+        futures = {name: executor.submit(cached_feather, *loaders[name]) for name in DATASETS if name in datasets}
+        frames = {name: future.result() for name, future in futures.items()}
+    dpf_maintenance, dpf_vehicle_stats, dpf_diagnostic = (frames.get(name) for name in DATASETS)
     
-    print(f"Maintenance records: {len(dpf_maintenance)}")
-    print(f"Vehicle stats records: {len(dpf_vehicle_stats)}")
-    print(f"Diagnostic records: {len(dpf_diagnostic)}")
+    if dpf_maintenance is not None:
+        print(f"Maintenance records: {len(dpf_maintenance)}")
+    if dpf_vehicle_stats is not None:
+        print(f"Vehicle stats records: {len(dpf_vehicle_stats)}")
+    if dpf_diagnostic is not None:
+        print(f"Diagnostic records: {len(dpf_diagnostic)}")
     
     return dpf_maintenance, dpf_vehicle_stats, dpf_diagnostic
 
@@ -41,56 +141,51 @@ def explore_maintenance_patterns(dpf_maintenance):
     print(f"\nMaintenance by job description:")
     print(dpf_maintenance['lines_jobDescriptions'].value_counts())
     
+    # Cost and downtime statistics per job type, aggregated over a single grouping
+    job_stats = {col: stats for col, stats in JOB_TYPE_STATS.items() if col in dpf_maintenance.columns}
+    if job_stats:
+        job_summary = dpf_maintenance.groupby('lines_jobDescriptions', observed=True).agg(job_stats).round(2)
+    
     # Maintenance costs
-    if 'Total_Cost' in dpf_maintenance.columns:
-        maintenance_costs = dpf_maintenance.groupby('lines_jobDescriptions')['Total_Cost'].agg(['count', 'mean', 'std', 'min', 'max']).round(2)
+    if 'Total_Cost' in job_stats:
         print(f"\nMaintenance costs by job type:")
-        print(maintenance_costs)
+        print(job_summary['Total_Cost'])
     
     # Downtime analysis
-    if 'Downtime Days' in dpf_maintenance.columns:
-        downtime_stats = dpf_maintenance.groupby('lines_jobDescriptions')['Downtime Days'].agg(['mean', 'std', 'min', 'max']).round(2)
+    if 'Downtime Days' in job_stats:
         print(f"\nDowntime by job type:")
-        print(downtime_stats)
+        print(job_summary['Downtime Days'])
     
     return vehicle_counts
 
-def explore_vehicle_stats_patterns(dpf_vehicle_stats, vehicle_counts):
+def explore_vehicle_stats_patterns(stats_path):
     """Explore vehicle statistics patterns"""
     print("\n=== VEHICLE STATISTICS PATTERNS ===")
     
-    # Data availability by sensor
-    sensor_cols = [col for col in dpf_vehicle_stats.columns if col not in ['time', 'vin']]
-    data_availability = {}
-    
-    for col in sensor_cols:
-        non_null_count = dpf_vehicle_stats[col].notna().sum()
-        total_count = len(dpf_vehicle_stats)
-        data_availability[col] = {
-            'non_null_count': non_null_count,
-            'availability_pct': (non_null_count / total_count) * 100
-        }
-    
-    # Sort by availability
-    availability_df = pd.DataFrame(data_availability).T
-    availability_df = availability_df.sort_values('availability_pct', ascending=False)
+    # Data availability by sensor, counted in a lazy scan so the readings are never materialized
+    stats_scan = pl.scan_parquet(stats_path)
+    sensor_cols = [col for col in stats_scan.collect_schema().names() if col not in ['time', 'vin']]
+    counts = stats_scan.select(
+        pl.len().alias('total_count'),
+        *[pl.col(col).is_not_null().sum() for col in sensor_cols]
+    ).collect(engine='streaming').row(0, named=True)
+    total_count = counts.pop('total_count')
+    non_null_counts = pd.Series(counts)
+    availability_df = pd.DataFrame({
+        'non_null_count': non_null_counts,
+        'availability_pct': non_null_counts * (100.0 / total_count)
+    })
     
+    # Only the 15 most available sensors are shown, so select them without sorting the whole table
     print(f"\nSensor data availability (top 15):")
-    print(availability_df.head(15))
+    print(availability_df.nlargest(15, 'availability_pct'))
     
     # Focus on high-availability sensors relevant to DPF
-    key_sensors = [
-        'engineLoadPercent', 'engineRpm', 'ecuSpeedMph', 
-        'engineOilPressureKPa', 'engineCoolantTemperatureMilliC',
-        'ambientAirTemperatureMilliC', 'intakeManifoldTemperatureMilliC',
-        'barometricPressurePa', 'fuelPercents', 'defLevelMilliPercent'
-    ]
-    
-    available_key_sensors = [sensor for sensor in key_sensors if sensor in availability_df.index and availability_df.loc[sensor, 'availability_pct'] > 1]
+    availability_pct = availability_df['availability_pct'].to_dict()
+    available_key_sensors = [sensor for sensor in KEY_SENSORS if availability_pct.get(sensor, 0) > 1]
     print(f"\nKey DPF-relevant sensors with >1% data availability:")
     for sensor in available_key_sensors:
-        pct = availability_df.loc[sensor, 'availability_pct']
-        print(f"- {sensor}: {pct:.2f}%")
+        print(f"- {sensor}: {availability_pct[sensor]:.2f}%")
     
     return available_key_sensors, availability_df
 
@@ -103,10 +198,16 @@ def explore_diagnostic_patterns(dpf_diagnostic):
     print(f"\nTop diagnostic parameters:")
     print(diagnostic_counts.head(15))
     
-    # Focus on DPF-related diagnostics
-    dpf_related_diagnostics = dpf_diagnostic[
-        dpf_diagnostic['Diagnostic'].str.contains('Exhaust|DPF|Particulate|EGR|NOx', case=False, na=False)
-    ]
+    # Focus on DPF-related diagnostics; the pattern is matched once per distinct
+    # diagnostic name and rows are selected by their category code
+    diagnostic_names = dpf_diagnostic['Diagnostic'].cat.categories
+    dpf_codes = np.flatnonzero(diagnostic_names.str.contains('Exhaust|DPF|Particulate|EGR|NOx', case=False, regex=True))
+    dpf_related_diagnostics = dpf_diagnostic[np.isin(dpf_diagnostic['Diagnostic'].cat.codes.to_numpy(), dpf_codes)]
+    
+    # Drop the non-DPF names from the categories so they are not counted as empty groups
+    dpf_related_diagnostics = dpf_related_diagnostics.assign(
+        Diagnostic=dpf_related_diagnostics['Diagnostic'].cat.remove_unused_categories()
+    )
     
     if len(dpf_related_diagnostics) > 0:
         print(f"\nDPF-related diagnostic parameters:")
@@ -122,114 +223,175 @@ def explore_diagnostic_patterns(dpf_diagnostic):
     
     return diagnostic_counts
 
+def locate_event_windows(events, vehicle_stats, window_days=30):
+    """
+    Map each event's [date - window_days, date) window to row positions in vehicle_stats sorted by (vin, time).
+    Each vin's block of rows is located once, then window bounds are binary-searched within it.
+    """
+    times = vehicle_stats['time'].to_numpy(dtype='datetime64[ns]')
+    vins = vehicle_stats['vin']
+    block_starts = np.flatnonzero((vins != vins.shift()).to_numpy())
+    block_ends = np.append(block_starts[1:], len(vins))
+    vin_blocks = dict(zip(vins.iloc[block_starts], zip(block_starts, block_ends)))
+    
+    window_end = events['Date of Issue'].to_numpy(dtype='datetime64[ns]')
+    window_start = window_end - np.timedelta64(window_days, 'D')
+    start_pos = np.zeros(len(events), dtype=np.int64)
+    end_pos = np.zeros(len(events), dtype=np.int64)
+    
+    for vin, positions in events.groupby('VIN Number', observed=True, sort=False).indices.items():
+        if vin not in vin_blocks:
+            continue
+        lo, hi = vin_blocks[vin]
+        block_times = times[lo:hi]
+        start_pos[positions] = lo + np.searchsorted(block_times, window_start[positions])
+        end_pos[positions] = lo + np.searchsorted(block_times, window_end[positions])
+    
+    return start_pos, end_pos
+
+@njit(parallel=True, cache=True)
+def _window_stats(values, starts, ends, out, counts):
+    """
+    For every window w (rows starts[w]:ends[w]) fill out[w, j] with the WINDOW_STATS of sensor column j
+    and counts[w, j] with its number of non-NaN readings, in one Welford pass per column. Statistics
+    of a column without readings are NaN, as is the std of a single reading. Windows run in parallel.
+    """
+    n_sensors = values.shape[1]
+    for w in prange(len(starts)):
+        for j in range(n_sensors):
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            lowest = np.inf
+            highest = -np.inf
+            for i in range(starts[w], ends[w]):
+                value = values[i, j]
+                if np.isnan(value):
+                    continue
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+                lowest = min(lowest, value)
+                highest = max(highest, value)
+            
+            counts[w, j] = count
+            out[w, j, :] = np.nan
+            if count == 0:
+                continue
+            out[w, j, 0] = mean
+            if count > 1:
+                out[w, j, 1] = np.sqrt(m2 / (count - 1))
+            out[w, j, 2] = lowest
+            out[w, j, 3] = highest
+
 def analyze_maintenance_timing(dpf_maintenance, dpf_vehicle_stats, available_sensors):
     """Analyze sensor patterns before maintenance events"""
     print("\n=== MAINTENANCE TIMING ANALYSIS ===")
     
-    # For each maintenance event, look at sensor data in the weeks before
-    results = []
+    # For each maintenance event, look at sensor data in the 30 days before it;
+    # only the sensors analyzed are carried into the sorted copy of the vehicle stats
+    events = dpf_maintenance.dropna(subset=['Date of Issue', 'VIN Number'])
+    sensors = [sensor for sensor in available_sensors if sensor in dpf_vehicle_stats.columns]
+    vehicle_stats = dpf_vehicle_stats[['vin', 'time'] + sensors].sort_values(['vin', 'time'], ignore_index=True)
+    start_pos, end_pos = locate_event_windows(events, vehicle_stats)
     
-    for idx, maintenance_event in dpf_maintenance.iterrows():
-        vin = maintenance_event['VIN Number']
-        vehicle_num = maintenance_event['Vehicle_Number']
-        maintenance_date = maintenance_event['Date of Issue']
-        job_type = maintenance_event['lines_jobDescriptions']
-        
-        if pd.isna(maintenance_date) or pd.isna(vin):
-            continue
-            
-        # Get sensor data for this vehicle
-        vehicle_data = dpf_vehicle_stats[dpf_vehicle_stats['vin'] == vin].copy()
-        
-        if len(vehicle_data) == 0:
-            continue
-            
-        # Look at data 30 days before maintenance
-        start_date = maintenance_date - timedelta(days=30)
-        pre_maintenance_data = vehicle_data[
-            (vehicle_data['time'] >= start_date) & 
-            (vehicle_data['time'] < maintenance_date)
-        ]
-        
-        if len(pre_maintenance_data) == 0:
-            continue
-            
-        # Calculate statistics for available sensors
-        sensor_stats = {}
-        for sensor in available_sensors:
-            if sensor in pre_maintenance_data.columns:
-                sensor_data = pre_maintenance_data[sensor].dropna()
-                if len(sensor_data) > 0:
-                    sensor_stats[sensor] = {
-                        'mean': sensor_data.mean(),
-                        'std': sensor_data.std(),
-                        'min': sensor_data.min(),
-                        'max': sensor_data.max(),
-                        'count': len(sensor_data)
-                    }
-        
-        results.append({
-            'vin': vin,
-            'vehicle_number': vehicle_num,
-            'maintenance_date': maintenance_date,
-            'job_type': job_type,
-            'days_of_data': len(pre_maintenance_data),
-            'sensor_stats': sensor_stats
-        })
+    days_of_data = end_pos - start_pos
+    has_data = days_of_data > 0
+    events, start_pos, days_of_data = events[has_data], start_pos[has_data], days_of_data[has_data]
+    event_index = pd.MultiIndex.from_arrays(
+        [events['VIN Number'], events['Vehicle_Number'], events['Date of Issue'], events['lines_jobDescriptions'], days_of_data],
+        names=['vin', 'vehicle_number', 'maintenance_date', 'job_type', 'days_of_data']
+    )
+    
+    # Without any available sensor, report the events with data but no sensor statistics
+    if not sensors:
+        print(f"Analyzed {len(events)} maintenance events with pre-maintenance sensor data")
+        for job_type, n_events in events.groupby('lines_jobDescriptions', observed=True, sort=False, dropna=False).size().items():
+            print(f"\n--- {job_type} ---")
+            print(f"Events analyzed: {n_events}")
+        empty_index = pd.MultiIndex.from_arrays([[], []], names=['job_type', 'sensor'])
+        return pd.DataFrame(index=event_index), pd.DataFrame(columns=['avg', 'std', 'n'], index=empty_index)
+    
+    # Summarize every window in one compiled pass over the sorted sensor matrix; the kernel
+    # streams each sensor over a window's rows, so column-major order keeps those reads stride-1
+    values = np.asfortranarray(vehicle_stats[sensors].to_numpy(dtype=np.float32))
+    out = np.empty((len(events), len(sensors), len(WINDOW_STATS)))
+    counts = np.empty((len(events), len(sensors)), dtype=np.int64)
+    _window_stats(values, start_pos, start_pos + days_of_data, out, counts)
+    
+    results = pd.DataFrame({
+        (sensor, stat): counts[:, j] if stat == 'count' else out[:, j, k]
+        for j, sensor in enumerate(sensors)
+        for k, stat in enumerate(WINDOW_STATS + ['count'])
+    }, index=event_index)
     
     print(f"Analyzed {len(results)} maintenance events with pre-maintenance sensor data")
     
-    # Aggregate patterns by job type
-    job_type_patterns = {}
-    for result in results:
-        job_type = result['job_type']
-        if job_type not in job_type_patterns:
-            job_type_patterns[job_type] = {'events': [], 'sensor_data': {}}
-        
-        job_type_patterns[job_type]['events'].append(result)
-        
-        # Aggregate sensor statistics
-        for sensor, stats in result['sensor_stats'].items():
-            if sensor not in job_type_patterns[job_type]['sensor_data']:
-                job_type_patterns[job_type]['sensor_data'][sensor] = []
-            job_type_patterns[job_type]['sensor_data'][sensor].append(stats['mean'])
+    # Aggregate the per-event sensor means by job type in one grouped pass
+    sensor_means = results.xs('mean', axis=1, level=1)
+    tidy = sensor_means.stack(future_stack=True).rename_axis(index={None: 'sensor'})
+    by_job_sensor = tidy.groupby(level=['job_type', 'sensor'], observed=True, sort=False, dropna=False)
+    job_type_patterns = pd.DataFrame({
+        'avg': by_job_sensor.mean(),
+        'std': by_job_sensor.std(ddof=0),
+        'n': by_job_sensor.count()
+    })
+    event_counts = sensor_means.groupby(level='job_type', observed=True, sort=False, dropna=False).size()
     
     # Print patterns for each job type
-    for job_type, patterns in job_type_patterns.items():
+    for job_type, n_events in event_counts.items():
         print(f"\n--- {job_type} ---")
-        print(f"Events analyzed: {len(patterns['events'])}")
+        print(f"Events analyzed: {n_events}")
         
-        for sensor, values in patterns['sensor_data'].items():
-            if len(values) > 2:  # Only show sensors with enough data
-                avg_value = np.mean(values)
-                std_value = np.std(values)
-                print(f"{sensor}: avg={avg_value:.2f}, std={std_value:.2f}, n={len(values)}")
+        job_summary = job_type_patterns.loc[job_type]
+        for sensor, avg_value, std_value, n in job_summary[job_summary['n'] > 2].itertuples():  # Only show sensors with enough data
+            print(f"{sensor}: avg={avg_value:.2f}, std={std_value:.2f}, n={n}")
     
     return results, job_type_patterns
 
-def main():
-    """Main exploration pipeline"""
+def main(analyses=tuple(ANALYSES)):
+    """Main exploration pipeline, running only the requested analyses and loading only the data they use"""
     print("=== DPF DATA EXPLORATION ===")
     
-    # Load processed data
-    dpf_maintenance, dpf_vehicle_stats, dpf_diagnostic = load_processed_data()
+    # The timing analysis runs on the sensors selected by the availability analysis
+    if 'timing' in analyses:
+        analyses = {*analyses, 'availability'}
+    
+    # Load processed data; vehicle stats only need the key sensors, as availability is counted from the Parquet scan
+    datasets = {dataset for name in analyses for dataset in ANALYSES[name]}
+    dpf_maintenance, dpf_vehicle_stats, dpf_diagnostic = load_processed_data(sensors=KEY_SENSORS, datasets=datasets)
     
     # Explore patterns
-    vehicle_counts = explore_maintenance_patterns(dpf_maintenance)
-    available_sensors, availability_df = explore_vehicle_stats_patterns(dpf_vehicle_stats, vehicle_counts)
-    diagnostic_counts = explore_diagnostic_patterns(dpf_diagnostic)
+    findings = []
+    if 'maintenance' in analyses:
+        vehicle_counts = explore_maintenance_patterns(dpf_maintenance)
+        findings.append(f"- {len(dpf_maintenance)} DPF maintenance events across {dpf_maintenance['Vehicle_Number'].nunique()} vehicles")
+    if 'availability' in analyses:
+        available_sensors, availability_df = explore_vehicle_stats_patterns(VEHICLE_STATS_PATH)
+        findings.append(f"- {len(available_sensors)} key sensors with >1% data availability")
+    if 'diagnostics' in analyses:
+        diagnostic_counts = explore_diagnostic_patterns(dpf_diagnostic)
+    
+    # The diagnostic readings are not needed past this point; release them before the timing analysis
+    del dpf_diagnostic
     
     # Analyze timing patterns
-    timing_results, job_patterns = analyze_maintenance_timing(
-        dpf_maintenance, dpf_vehicle_stats, available_sensors
-    )
+    if 'timing' in analyses:
+        timing_results, job_patterns = analyze_maintenance_timing(
+            dpf_maintenance, dpf_vehicle_stats, available_sensors
+        )
+        findings.append(f"- {len(timing_results)} maintenance events have pre-maintenance sensor data")
+        findings.append(f"- {len(timing_results.index.unique(level='job_type'))} different job types analyzed")
     
     print("\n=== EXPLORATION COMPLETE ===")
     print(f"Key findings:")
-    print(f"- {len(dpf_maintenance)} DPF maintenance events across {dpf_maintenance['Vehicle_Number'].nunique()} vehicles")
-    print(f"- {len(available_sensors)} key sensors with >1% data availability")
-    print(f"- {len(timing_results)} maintenance events have pre-maintenance sensor data")
-    print(f"- {len(job_patterns)} different job types analyzed")
+    for finding in findings:
+        print(finding)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="DPF data exploration")
+    parser.add_argument('--analyses', nargs='+', choices=list(ANALYSES), default=list(ANALYSES),
+                        help="analyses to run (default: all)")
+    args = parser.parse_args()
+    main(analyses=args.analyses)
\ No newline at end of file
@@ -15,12 +15,16 @@ Key Objectives:
 Author: RUL Analysis Pipeline
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 import warnings
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from dpf_data import wall_clock_time
 
 # Nixtla StatsForecast imports
 try:
@@ -39,10 +43,89 @@ except ImportError as e:
 
 warnings.filterwarnings('ignore')
 
-# Set up plotting
-plt.style.use('default')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (15, 8)
+# DPF-critical sensors (prioritized by importance)
+CRITICAL_SENSORS = [
+    'defLevelMilliPercent',          # DEF fluid level - critical for DPF regen
+    'engineLoadPercent',             # Engine load - affects DPF loading
+    'engineCoolantTemperatureMilliC', # Temperature - affects DPF efficiency  
+    'engineRpm',                     # RPM - affects DPF burn-off
+    'ecuSpeedMph',                   # Speed - highway vs city affects DPF
+    'fuelPercents',                  # Fuel level - affects operations
+    'ambientAirTemperatureMilliC',   # Ambient temp - affects DPF performance
+    'engineOilPressureKPa',          # Oil pressure - system health
+    'intakeManifoldTemperatureMilliC', # Intake temp - combustion efficiency
+    'barometricPressurePa'           # Atmospheric pressure - affects combustion
+]
+
+# Only these columns are read from the vehicle stats files, with one compact dtype schema for both
+# sources: Arrow-backed VIN strings and float32 sensor readings
+CRITICAL_COLS = ['time', 'vin', *CRITICAL_SENSORS]
+SENSOR_DTYPES = {'vin': 'string[pyarrow]', **{sensor: 'float32' for sensor in CRITICAL_SENSORS}}
+
+# The CSV is parsed in blocks of this many bytes, so raw text is never held for the whole file
+CSV_BLOCK_SIZE = 64 << 20
+
+# Combined, deduplicated and sorted readings, reused until either source file changes
+SENSOR_SOURCES = ['data/dpf_vehicle_stats.parquet', 'data/vehicle_stats_23-24.csv']
+SENSOR_CACHE = Path('data/cache/univariate_sensor_data.parquet')
+
+
+def combine_sensor_sources():
+    """Read, combine and deduplicate both vehicle stats files, caching the result as Parquet."""
+    # Load both vehicle stats files, keeping only the critical sensor columns
+    parquet_path, csv_path = SENSOR_SOURCES
+    parquet_columns = [col for col in pq.read_schema(parquet_path).names if col in CRITICAL_COLS]
+    sensor_df_2024 = pd.read_parquet(parquet_path, columns=parquet_columns)
+    
+    # Parse the CSV block by block with Arrow's threaded reader; each batch is already projected
+    # to the critical columns and typed (float32 readings; timestamps stay text so any zone
+    # offset is handled in pandas), so only those compact batches are kept and assembled into one table
+    csv_columns = [col for col in pd.read_csv(csv_path, nrows=0).columns if col in CRITICAL_COLS]
+    column_types = {col: pa.float32() for col in csv_columns}
+    column_types.update({'time': pa.string(), 'vin': pa.string()})
+    csv_reader = pv.open_csv(
+        csv_path,
+        read_options=pv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=pv.ConvertOptions(include_columns=csv_columns, column_types=column_types)
+    )
+    csv_table = pa.Table.from_batches(list(csv_reader), schema=csv_reader.schema)
+    
+    # Convert to pandas releasing each Arrow column as soon as it is copied, so the table and the
+    # frame are never both fully resident; VINs map straight to string[pyarrow] and readings stay
+    # float32, so no astype copy follows
+    sensor_df_2023 = csv_table.to_pandas(
+        types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get,
+        split_blocks=True,
+        self_destruct=True
+    )
+    del csv_table
+    
+    # Bring the Parquet columns to the same schema so both frames combine column for column,
+    # with both time columns as naive wall-clock time before they are compared for duplicates
+    sensor_df_2024 = sensor_df_2024.astype({col: dtype for col, dtype in SENSOR_DTYPES.items() if col in parquet_columns})
+    for sensor_df_part in (sensor_df_2023, sensor_df_2024):
+        sensor_df_part['time'] = wall_clock_time(sensor_df_part['time'])
+    
+    # Combine datasets
+    sensor_df = pd.concat([sensor_df_2023, sensor_df_2024], ignore_index=True)
+    
+    # Remove duplicates
+    initial_rows = len(sensor_df)
+    sensor_df = sensor_df.drop_duplicates(subset=['time', 'vin'], keep='first')
+    duplicates_removed = initial_rows - len(sensor_df)
+    
+    print(f"✅ Combined sensor data: {len(sensor_df):,} records")
+    if duplicates_removed > 0:
+        print(f"   🗑️ Removed {duplicates_removed:,} duplicates")
+    
+    # Sort by time
+    sensor_df = sensor_df.sort_values('time').reset_index(drop=True)
+    
+    SENSOR_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    sensor_df.to_parquet(SENSOR_CACHE, compression='zstd', engine='pyarrow', index=False)
+    print(f"   💾 Saved {SENSOR_CACHE}")
+    
+    return sensor_df
 
 
 def load_dpf_sensor_data():
@@ -50,27 +133,11 @@ def load_dpf_sensor_data():
     print("📊 Loading DPF sensor data for time-series analysis...")
     
     try:
-        # Load both vehicle stats files
-        sensor_df_2024 = pd.read_csv('data/dpf_vehicle_stats.csv')
-        sensor_df_2023 = pd.read_csv('data/vehicle_stats_23-24.csv')
-        
-        # Combine datasets
-        sensor_df = pd.concat([sensor_df_2023, sensor_df_2024], ignore_index=True)
-        
-        # Remove duplicates
-        initial_rows = len(sensor_df)
-        sensor_df = sensor_df.drop_duplicates(subset=['time', 'vin'], keep='first')
-        duplicates_removed = initial_rows - len(sensor_df)
-        
-        print(f"✅ Combined sensor data: {len(sensor_df):,} records")
-        if duplicates_removed > 0:
-            print(f"   🗑️ Removed {duplicates_removed:,} duplicates")
-        
-        # Convert time column
-        sensor_df['time'] = pd.to_datetime(sensor_df['time']).dt.tz_localize(None)
-        
-        # Sort by time
-        sensor_df = sensor_df.sort_values('time').reset_index(drop=True)
+        if SENSOR_CACHE.exists() and all(SENSOR_CACHE.stat().st_mtime >= Path(src).stat().st_mtime for src in SENSOR_SOURCES):
+            sensor_df = pd.read_parquet(SENSOR_CACHE)
+            print(f"✅ Loaded cached sensor data from {SENSOR_CACHE}: {len(sensor_df):,} records")
+        else:
+            sensor_df = combine_sensor_sources()
         
         print(f"📅 Time range: {sensor_df['time'].min()} to {sensor_df['time'].max()}")
         print(f"🚗 Unique vehicles: {sensor_df['vin'].nunique():,}")
@@ -86,68 +153,35 @@ def identify_critical_dpf_sensors(sensor_df, min_data_points=1000):
     """Identify sensors most critical for DPF health with sufficient data."""
     print(f"\n🔍 Identifying critical DPF sensors...")
     
-    # DPF-critical sensors (prioritized by importance)
-    critical_sensors = [
-        'defLevelMilliPercent',          # DEF fluid level - critical for DPF regen
-        'engineLoadPercent',             # Engine load - affects DPF loading
-        'engineCoolantTemperatureMilliC', # Temperature - affects DPF efficiency  
-        'engineRpm',                     # RPM - affects DPF burn-off
-        'ecuSpeedMph',                   # Speed - highway vs city affects DPF
-        'fuelPercents',                  # Fuel level - affects operations
-        'ambientAirTemperatureMilliC',   # Ambient temp - affects DPF performance
-        'engineOilPressureKPa',          # Oil pressure - system health
-        'intakeManifoldTemperatureMilliC', # Intake temp - combustion efficiency
-        'barometricPressurePa'           # Atmospheric pressure - affects combustion
-    ]
+    # Data quality metrics for every present sensor in one aggregation call
+    present = [sensor for sensor in CRITICAL_SENSORS if sensor in sensor_df.columns]
+    quality = sensor_df[present].agg(['count', 'nunique', 'mean', 'std']).T
+    quality['coverage'] = quality['count'] / len(sensor_df) * 100
+    quality['cv'] = (quality['std'] / quality['mean']).where(quality['mean'] != 0, 0)
     
-    # Check data availability for each sensor
-    sensor_quality = {}
-    
-    for sensor in critical_sensors:
-        if sensor not in sensor_df.columns:
-            continue
-            
-        # Calculate data quality metrics
-        total_records = len(sensor_df)
-        non_null_records = sensor_df[sensor].notna().sum()
-        data_coverage = (non_null_records / total_records) * 100
-        
-        # Check if values are not all identical (meaningful variation)
-        unique_values = sensor_df[sensor].nunique()
-        has_variation = unique_values > 10
-        
-        if non_null_records >= min_data_points and has_variation:
-            sensor_quality[sensor] = {
-                'records': non_null_records,
-                'coverage': data_coverage,
-                'unique_values': unique_values,
-                'mean': sensor_df[sensor].mean(),
-                'std': sensor_df[sensor].std(),
-                'cv': sensor_df[sensor].std() / sensor_df[sensor].mean() if sensor_df[sensor].mean() != 0 else 0
-            }
-    
-    # Sort by data coverage and variation
-    sorted_sensors = sorted(sensor_quality.items(), 
-                           key=lambda x: (x[1]['coverage'], x[1]['unique_values']), 
-                           reverse=True)
+    # Keep sensors with enough data and meaningful variation (not all identical values),
+    # sorted by data coverage and variation
+    quality = quality[(quality['count'] >= min_data_points) & (quality['nunique'] > 10)]
+    quality = quality.sort_values(['coverage', 'nunique'], ascending=False)
+    sorted_sensors = [(sensor, row) for sensor, row in quality.iterrows()]
     
     print(f"\n📈 Top DPF-Critical Sensors (Data Quality):")
     for i, (sensor, stats) in enumerate(sorted_sensors[:5]):
         print(f"   {i+1}. {sensor}")
-        print(f"      📊 {stats['records']:,} records ({stats['coverage']:.1f}% coverage)")
-        print(f"      🔄 {stats['unique_values']:,} unique values")
+        print(f"      📊 {int(stats['count']):,} records ({stats['coverage']:.1f}% coverage)")
+        print(f"      🔄 {int(stats['nunique']):,} unique values")
         print(f"      📉 CV: {stats['cv']:.3f} (variation)")
         print()
     
     return [sensor for sensor, _ in sorted_sensors[:3]]  # Return top 3
 
 
-def prepare_time_series_data(sensor_df, sensor_name, aggregation='daily'):
-    """Prepare sensor data for time-series forecasting."""
+def prepare_time_series_data(sensor_df, sensor_name, aggregation='daily', day_col='day'):
+    """Prepare sensor data for time-series forecasting, grouping on the precomputed day_col."""
     print(f"\n🔧 Preparing {sensor_name} for time-series analysis...")
     
     # Filter non-null values
-    sensor_data = sensor_df[['time', 'vin', sensor_name]].dropna()
+    sensor_data = sensor_df[[day_col, 'vin', sensor_name]].dropna()
     
     if len(sensor_data) == 0:
         print(f"❌ No data available for {sensor_name}")
@@ -157,61 +191,58 @@ def prepare_time_series_data(sensor_df, sensor_name, aggregation='daily'):
     
     # Aggregate data by time period
     if aggregation == 'daily':
-        # Daily aggregation across all vehicles
-        daily_data = sensor_data.groupby(sensor_data['time'].dt.date)[sensor_name].agg([
+        # Daily aggregation across all vehicles, grouped on the datetime64 day keys (sorted)
+        daily_data = sensor_data.groupby(day_col)[sensor_name].agg([
             'mean', 'median', 'std', 'count'
         ]).reset_index()
         
-        daily_data['time'] = pd.to_datetime(daily_data['time'])
-        daily_data = daily_data.sort_values('time')
-        
         # Create time-series dataframe for StatsForecast
         ts_df = pd.DataFrame({
             'unique_id': f'fleet_avg_{sensor_name}',
-            'ds': daily_data['time'],
+            'ds': daily_data[day_col],
             'y': daily_data['mean']
         })
         
         print(f"   📅 Daily aggregation: {len(ts_df)} days")
         
     elif aggregation == 'per_vehicle':
-        # Per-vehicle time series (select vehicles with most data)
+        # Per-vehicle time series (select vehicles with most data), built in one groupby over
+        # (vehicle, day); the VIN key is categorical in top-vehicle order so series keep that order
         vehicle_counts = sensor_data['vin'].value_counts()
         top_vehicles = vehicle_counts.head(5).index
         
-        ts_list = []
-        for vin in top_vehicles:
-            vehicle_data = sensor_data[sensor_data['vin'] == vin].copy()
-            vehicle_data = vehicle_data.groupby(vehicle_data['time'].dt.date)[sensor_name].mean().reset_index()
-            vehicle_data['time'] = pd.to_datetime(vehicle_data['time'])
-            
-            if len(vehicle_data) >= 30:  # Minimum 30 days of data
-                vehicle_ts = pd.DataFrame({
-                    'unique_id': f'{vin}_{sensor_name}',
-                    'ds': vehicle_data['time'],
-                    'y': vehicle_data[sensor_name]
-                })
-                ts_list.append(vehicle_ts)
-        
-        if ts_list:
-            ts_df = pd.concat(ts_list, ignore_index=True)
-            print(f"   🚗 Per-vehicle series: {len(ts_list)} vehicles, {len(ts_df)} total points")
+        top_data = sensor_data[sensor_data['vin'].isin(top_vehicles)]
+        vehicle_keys = pd.Categorical(top_data['vin'], categories=top_vehicles)
+        vehicle_daily = top_data.groupby(
+            [vehicle_keys, top_data[day_col]], observed=True
+        )[sensor_name].mean().rename_axis(['vin', day_col]).reset_index()
+        
+        # Minimum 30 days of data per vehicle
+        days_per_vehicle = vehicle_daily.groupby('vin', observed=True)[day_col].transform('size')
+        vehicle_daily = vehicle_daily[days_per_vehicle >= 30]
+        
+        if len(vehicle_daily) > 0:
+            ts_df = pd.DataFrame({
+                'unique_id': vehicle_daily['vin'].astype(str) + f'_{sensor_name}',
+                'ds': vehicle_daily[day_col],
+                'y': vehicle_daily[sensor_name]
+            })
+            print(f"   🚗 Per-vehicle series: {ts_df['unique_id'].nunique()} vehicles, {len(ts_df)} total points")
         else:
             print(f"   ❌ No vehicles with sufficient data")
             return None
     
-    # Remove any infinite or extreme outliers
-    ts_df = ts_df.replace([np.inf, -np.inf], np.nan).dropna()
-    
-    # Remove extreme outliers (beyond 3 standard deviations)
-    q1 = ts_df['y'].quantile(0.25)
-    q3 = ts_df['y'].quantile(0.75)
+    # Remove any infinite or extreme outliers (beyond 3 IQRs of the finite values) with one mask
+    y = ts_df['y'].to_numpy()
+    finite = np.isfinite(y)
+    q1, q3 = np.quantile(y[finite], [0.25, 0.75])
     iqr = q3 - q1
     lower_bound = q1 - 3 * iqr
     upper_bound = q3 + 3 * iqr
     
-    outliers_removed = len(ts_df) - len(ts_df[(ts_df['y'] >= lower_bound) & (ts_df['y'] <= upper_bound)])
-    ts_df = ts_df[(ts_df['y'] >= lower_bound) & (ts_df['y'] <= upper_bound)]
+    in_range = (y >= lower_bound) & (y <= upper_bound)
+    outliers_removed = int((finite & ~in_range).sum())
+    ts_df = ts_df[finite & in_range]
     
     if outliers_removed > 0:
         print(f"   🗑️ Removed {outliers_removed} extreme outliers")
@@ -242,17 +273,34 @@ def perform_univariate_forecasting(ts_df, forecast_horizon=30):
         AutoARIMA(season_length=7)        # Auto ARIMA (weekly seasonality)
     ]
     
-    # Initialize StatsForecast
-    sf = StatsForecast(
-        models=models,
-        freq='D',  # Daily frequency
-        n_jobs=-1  # Use all CPU cores
-    )
+    # Essentially flat series (tiny relative spread or only a handful of distinct values) and series
+    # shorter than two seasons leave the automatic model searches nothing to find, so they are
+    # forecast with the Naive baseline only and the full model list is fitted on the rest
+    series_stats = ts_df.groupby('unique_id', sort=False)['y'].agg(['size', 'mean', 'std', 'nunique'])
+    flat = (series_stats['std'] / (series_stats['mean'].abs() + 1e-9) < 1e-3) | (series_stats['nunique'] < 5)
+    trivial_ids = series_stats.index[flat | (series_stats['size'] < 2 * 7)]
+    
+    if len(trivial_ids) > 0:
+        print(f"   ⏭️ Naive-only forecast for {len(trivial_ids)} flat or short series")
+    
+    trivial = ts_df['unique_id'].isin(trivial_ids)
+    batches = [(ts_df[~trivial], models), (ts_df[trivial], [Naive()])]
     
     try:
-        # Generate forecasts
+        # Generate forecasts; models not fitted for a series are NaN in its rows
         print("   🔄 Training models and generating forecasts...")
-        forecasts = sf.forecast(df=ts_df, h=forecast_horizon)
+        forecasts = []
+        for ts_batch, batch_models in batches:
+            if len(ts_batch) == 0:
+                continue
+            
+            sf = StatsForecast(
+                models=batch_models,
+                freq='D',  # Daily frequency
+                n_jobs=-1  # Use all CPU cores
+            )
+            forecasts.append(sf.forecast(df=ts_batch, h=forecast_horizon))
+        forecasts = pd.concat(forecasts, ignore_index=True)
         
         # Skip prediction intervals for now - focus on main forecasting
         print("   📊 Skipping prediction intervals for simplicity...")
@@ -269,16 +317,23 @@ def perform_univariate_forecasting(ts_df, forecast_horizon=30):
         return None, None
 
 
-def analyze_forecasting_results(ts_df, forecasts, prediction_intervals, sensor_name):
-    """Analyze and visualize forecasting results."""
-    
-    if forecasts is None:
-        return
-    
-    print(f"\n📊 Analyzing forecasting results for {sensor_name}...")
-    
-    # Get unique series
-    unique_series = ts_df['unique_id'].unique()
+def _maybe_import_plt():
+    """Import and configure matplotlib/seaborn on first use so headless runs skip the import."""
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend so batch runs never block on a window
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # Set up plotting
+    plt.style.use('default')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (15, 8)
+    return plt
+
+
+def _render_forecast_plots(ts_df, forecasts, prediction_intervals, sensor_name, unique_series):
+    """Plot history and model forecasts for the first 4 series and save the figure as a PNG."""
+    plt = _maybe_import_plt()
     
     # Create comprehensive visualization
     fig, axes = plt.subplots(2, 2, figsize=(20, 12))
@@ -291,7 +346,7 @@ def analyze_forecasting_results(ts_df, forecasts, prediction_intervals, sensor_n
         
         # Historical data
         historical = ts_df[ts_df['unique_id'] == series_id].copy()
-        forecast_data = forecasts[forecasts['unique_id'] == series_id].copy()
+        forecast_data = forecasts[forecasts['unique_id'] == series_id].dropna(axis=1, how='all')
         
         if len(historical) == 0 or len(forecast_data) == 0:
             continue
@@ -330,14 +385,32 @@ def analyze_forecasting_results(ts_df, forecasts, prediction_intervals, sensor_n
         plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
     
     plt.tight_layout()
-    plt.show()
+    output_path = f'univariate_forecast_{sensor_name}.png'
+    fig.savefig(output_path, dpi=100, bbox_inches='tight')
+    plt.close(fig)
+    print(f"   💾 Saved {output_path}")
+
+
+def analyze_forecasting_results(ts_df, forecasts, prediction_intervals, sensor_name, plot=False):
+    """Analyze forecasting results; plot=True also saves the forecast plots."""
+    
+    if forecasts is None:
+        return
+    
+    print(f"\n📊 Analyzing forecasting results for {sensor_name}...")
+    
+    # Get unique series
+    unique_series = ts_df['unique_id'].unique()
+    
+    if plot:
+        _render_forecast_plots(ts_df, forecasts, prediction_intervals, sensor_name, unique_series)
     
     # Print forecasting insights
     print(f"\n💡 Forecasting Insights for {sensor_name}:")
     
     # Calculate forecast trends
     for series_id in unique_series[:3]:  # Analyze first 3 series
-        forecast_data = forecasts[forecasts['unique_id'] == series_id]
+        forecast_data = forecasts[forecasts['unique_id'] == series_id].dropna(axis=1, how='all')
         historical_data = ts_df[ts_df['unique_id'] == series_id]
         
         if len(forecast_data) == 0 or len(historical_data) == 0:
@@ -367,8 +440,8 @@ def analyze_forecasting_results(ts_df, forecasts, prediction_intervals, sensor_n
                 print(f"      ⚡ Engine load increasing - higher DPF stress expected")
 
 
-def main():
-    """Main univariate forecasting pipeline."""
+def main(plot=False):
+    """Main univariate forecasting pipeline; plot=True also saves the forecast plots."""
     print("🚀 UNIVARIATE SENSOR FORECASTING FOR DPF RUL")
     print("="*60)
     
@@ -377,6 +450,9 @@ def main():
     if sensor_df is None:
         return
     
+    # Calendar day of every reading, truncated once with a NumPy cast and shared by all sensors
+    sensor_df['day'] = sensor_df['time'].to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
+    
     # Identify critical sensors
     critical_sensors = identify_critical_dpf_sensors(sensor_df)
     
@@ -386,24 +462,38 @@ def main():
     
     print(f"\n🎯 Selected sensors for forecasting: {critical_sensors}")
     
-    # Perform forecasting for each critical sensor
+    # Prepare time-series data for each critical sensor
+    sensor_series = {}
     for sensor_name in critical_sensors[:2]:  # Start with top 2 sensors
-        print(f"\n{'='*60}")
-        print(f"📊 FORECASTING: {sensor_name}")
-        print(f"{'='*60}")
-        
-        # Prepare time-series data
         ts_df = prepare_time_series_data(sensor_df, sensor_name, aggregation='daily')
         
         if ts_df is None:
             print(f"⏭️ Skipping {sensor_name} - insufficient data")
             continue
         
-        # Perform forecasting
-        forecasts, prediction_intervals = perform_univariate_forecasting(ts_df, forecast_horizon=30)
+        sensor_series[sensor_name] = ts_df
+    
+    if not sensor_series:
+        print("❌ No sensor time series to forecast")
+        return
+    
+    # Forecast every sensor's series in one StatsForecast call, so model fitting is
+    # spread across all series at once instead of one sensor at a time
+    forecasts, prediction_intervals = perform_univariate_forecasting(
+        pd.concat(sensor_series.values(), ignore_index=True), forecast_horizon=30
+    )
+    
+    # Analyze results for each sensor
+    for sensor_name, ts_df in sensor_series.items():
+        print(f"\n{'='*60}")
+        print(f"📊 FORECASTING: {sensor_name}")
+        print(f"{'='*60}")
+        
+        sensor_forecasts = None
+        if forecasts is not None:
+            sensor_forecasts = forecasts[forecasts['unique_id'].isin(ts_df['unique_id'].unique())]
         
-        # Analyze results
-        analyze_forecasting_results(ts_df, forecasts, prediction_intervals, sensor_name)
+        analyze_forecasting_results(ts_df, sensor_forecasts, prediction_intervals, sensor_name, plot=plot)
     
     print(f"\n🎉 Univariate forecasting analysis complete!")
     print(f"📋 Next steps:")
@@ -413,4 +503,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Univariate DPF sensor forecasting")
+    parser.add_argument('--plot', action='store_true', help="save the forecast plots as PNGs")
+    args = parser.parse_args()
+    main(plot=args.plot)
\ No newline at end of file
@@ -63,10 +63,10 @@ def load_dpf_datasets():
     print("📊 Loading DPF datasets for multivariate analysis...")
     
     try:
-        maintenance_df = pd.read_csv('data/dpf_maintenance_records.csv')
+        maintenance_df = pd.read_parquet('data/dpf_maintenance_records.parquet')
         
         # Load and combine both vehicle stats files
-        sensor_df_2024 = pd.read_csv('data/dpf_vehicle_stats.csv')
+        sensor_df_2024 = pd.read_parquet('data/dpf_vehicle_stats.parquet')
         sensor_df_2023 = pd.read_csv('data/vehicle_stats_23-24.csv')
         
         # Combine datasets and remove duplicates
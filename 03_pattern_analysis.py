@@ -19,9 +19,9 @@ def load_processed_data():
     """Load the processed DPF datasets"""
     print("Loading processed DPF datasets...")
     
-    dpf_maintenance = pd.read_csv('data/dpf_maintenance_records.csv')
-    dpf_vehicle_stats = pd.read_csv('data/dpf_vehicle_stats.csv')
-    dpf_diagnostic = pd.read_csv('data/dpf_diagnostic_data.csv')
+    dpf_maintenance = pd.read_parquet('data/dpf_maintenance_records.parquet')
+    dpf_vehicle_stats = pd.read_parquet('data/dpf_vehicle_stats.parquet')
+    dpf_diagnostic = pd.read_parquet('data/dpf_diagnostic_data.parquet')
     
     # Convert time columns and handle timezone
     dpf_maintenance['Date of Issue'] = pd.to_datetime(dpf_maintenance['Date of Issue']).dt.tz_localize(None)
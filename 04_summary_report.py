@@ -14,9 +14,9 @@ def generate_executive_summary():
     print("="*60)
     
     # Load processed data for summary statistics
-    dpf_maintenance = pd.read_csv('data/dpf_maintenance_records.csv')
-    dpf_vehicle_stats = pd.read_csv('data/dpf_vehicle_stats.csv')
-    dpf_diagnostic = pd.read_csv('data/dpf_diagnostic_data.csv')
+    dpf_maintenance = pd.read_parquet('data/dpf_maintenance_records.parquet')
+    dpf_vehicle_stats = pd.read_parquet('data/dpf_vehicle_stats.parquet')
+    dpf_diagnostic = pd.read_parquet('data/dpf_diagnostic_data.parquet')
     
     print(f"\n📊 DATASET OVERVIEW:")
     print(f"   • Total DPF maintenance events: {len(dpf_maintenance)}")
@@ -105,7 +105,7 @@ def generate_actionable_recommendations():
 
 def generate_business_impact():
     """Calculate potential business impact"""
-    dpf_maintenance = pd.read_csv('data/dpf_maintenance_records.csv')
+    dpf_maintenance = pd.read_parquet('data/dpf_maintenance_records.parquet')
     
     print(f"\n💼 BUSINESS IMPACT ANALYSIS:")
     
@@ -205,9 +205,9 @@ def main():
     print(f"   • 02_data_exploration.py - Exploratory analysis")
     print(f"   • 03_pattern_analysis.py - Machine learning analysis")
     print(f"   • 04_summary_report.py - This comprehensive report")
-    print(f"   • data/dpf_maintenance_records.csv - Filtered maintenance data")
-    print(f"   • data/dpf_vehicle_stats.csv - Relevant sensor data")
-    print(f"   • data/dpf_diagnostic_data.csv - Diagnostic readings")
+    print(f"   • data/dpf_maintenance_records.parquet - Filtered maintenance data")
+    print(f"   • data/dpf_vehicle_stats.parquet - Relevant sensor data")
+    print(f"   • data/dpf_diagnostic_data.parquet - Diagnostic readings")
     
     print(f"\n🎉 Ready for implementation!")
 
@@ -0,0 +1,86 @@
+"""
+Shared DPF data loading helpers and column schemas used by the data munging and forecasting scripts
+"""
+
+import pandas as pd
+import polars as pl
+from pathlib import Path
+
+# Columns referenced downstream, with narrow dtypes to cut parse cost and memory;
+# identifier strings are Arrow-backed so isin/unique hash contiguous buffers, and
+# high-repeat labels are categorical so nunique only walks the category codes
+RTA_USECOLS = ['VIN Number', 'Vehicle_Number', 'lines_jobDescriptions', 'Date of Issue', 'Total_Cost', 'Downtime Days']
+RTA_DTYPES = {'VIN Number': pl.String, 'Vehicle_Number': pl.String}
+RTA_DATE_FORMAT = '%m/%d/%Y'
+RTA_PANDAS_DTYPES = {
+    'VIN Number': 'string[pyarrow]',
+    'Vehicle_Number': 'string[pyarrow]',
+    'lines_jobDescriptions': 'category'
+}
+DIAGNOSTIC_USECOLS = ['Asset Name', 'Diagnostic', 'Time', 'Value', 'Unit']
+DIAGNOSTIC_DTYPES = {'Asset Name': 'category', 'Diagnostic': 'category'}
+
+# Known numeric sensor readings in the vehicle stats export, read as float32; the export is wide
+# and its other, rarely populated columns keep an inferred type
+SENSOR_COLUMNS = [
+    'engineLoadPercent', 'engineRpm', 'ecuSpeedMph',
+    'engineOilPressureKPa', 'engineCoolantTemperatureMilliC',
+    'ambientAirTemperatureMilliC', 'intakeManifoldTemperatureMilliC',
+    'barometricPressurePa', 'fuelPercents', 'defLevelMilliPercent'
+]
+
+# Parsed/filtered loader outputs, reused until a source CSV changes
+CACHE_DIR = Path('data/cache')
+
+def cached_parquet(sources, parquet_path, loader, *args):
+    """Load a Parquet cache if it is newer than every source CSV, else run loader and cache its result"""
+    parquet_path = Path(parquet_path)
+    if parquet_path.exists() and all(parquet_path.stat().st_mtime >= Path(src).stat().st_mtime for src in sources):
+        print(f"\nUsing cached {parquet_path}")
+        return pd.read_parquet(parquet_path)
+    
+    df = loader(*args)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(parquet_path, compression='zstd', engine='pyarrow', index=False)
+    return df
+
+def wall_clock_time(time_col):
+    """Parse timestamps to naive wall-clock datetimes, as pd.to_datetime(...).dt.tz_localize(None) does"""
+    time_col = pd.to_datetime(time_col, format='ISO8601')
+    if time_col.dt.tz is not None:
+        time_col = time_col.dt.tz_localize(None)
+    return time_col.astype('datetime64[ns]')
+
+def load_and_filter_rta_data():
+    """Load RTA data and filter for DPF-related maintenance events"""
+    print("Loading RTA data...")
+    
+    # Filter for DPF-related maintenance
+    dpf_keywords = ["FILTER - DIESEL PARTICULATE", "EXHAUST SYSTEM", "EXHAUST SYSTEM INSPECT DIAGNOSE"]
+    
+    # Push the keyword filter into a lazy scan so only matching rows are materialized
+    rta_scan = pl.scan_csv('data/rta-data.csv', schema_overrides=RTA_DTYPES, infer_schema_length=10000)
+    rta_columns = rta_scan.collect_schema().names()
+    print(f"Columns: {rta_columns}")
+    
+    dpf_rta = (
+        rta_scan
+        .select([col for col in RTA_USECOLS if col in rta_columns])
+        .filter(pl.col('lines_jobDescriptions').is_in(dpf_keywords))
+        .collect(engine='streaming')
+        .to_pandas()
+    )
+    dpf_rta = dpf_rta.astype(RTA_PANDAS_DTYPES)
+    
+    # Parse dates once at load with the RTA export's fixed format, so no per-run format inference
+    dpf_rta['Date of Issue'] = pd.to_datetime(dpf_rta['Date of Issue'], format=RTA_DATE_FORMAT, cache=True)
+    
+    print(f"DPF-related maintenance records: {len(dpf_rta)}")
+    print(f"Unique VINs with DPF issues: {dpf_rta['VIN Number'].nunique()}")
+    print(f"Unique Vehicle Numbers with DPF issues: {dpf_rta['Vehicle_Number'].nunique()}")
+    
+    # Show breakdown by job description
+    print("\nDPF maintenance breakdown:")
+    print(dpf_rta['lines_jobDescriptions'].value_counts())
+    
+    return dpf_rta